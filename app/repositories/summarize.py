@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import math
+import re
+
+from app.core.settings import settings
+from app.services.gemini import GeminiClient
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a Gemini token for Latin-script text.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimates the number of tokens in a text without calling the API."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_into_chunks(text: str, chunk_tokens: int) -> list[str]:
+    """
+    Splits a text into chunks of at most chunk_tokens, breaking between sentences.
+
+    Auto-generated captions often have no punctuation, so overlong sentences
+    are split between words.
+    """
+    max_chars = chunk_tokens * CHARS_PER_TOKEN
+    pieces: list[str] = []
+    for sentence in re.split(r"(?<=[.!?])\s+", text.strip()):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        words = sentence.split()
+        group: list[str] = []
+        size = 0
+        for word in words:
+            if group and size + len(word) + 1 > max_chars:
+                pieces.append(" ".join(group))
+                group, size = [], 0
+            group.append(word)
+            size += len(word) + 1
+        if group:
+            pieces.append(" ".join(group))
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 1 > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def _summarize_chunks(
+    gemini: GeminiClient,
+    chunks: list[str],
+    target_language: str,
+    semaphore: asyncio.Semaphore,
+) -> list[str]:
+    """Map step: summarizes every chunk concurrently, keeping their order."""
+
+    async def summarize_chunk(index: int, chunk: str) -> str:
+        prompt = (
+            f"This is part {index + 1} of {len(chunks)} of a video transcript. "
+            "Write concise notes of this part, "
+            "keeping every important detail, fact and example. "
+            f"The notes should be in {target_language}:\n\n{chunk}"
+        )
+        async with semaphore:
+            return await gemini.generate(prompt)
+
+    return list(
+        await asyncio.gather(
+            *(summarize_chunk(index, chunk) for index, chunk in enumerate(chunks)),
+        ),
+    )
+
+
+async def condense_long_text(
+    gemini: GeminiClient,
+    text: str,
+    target_language: str,
+) -> str:
+    """
+    Map step of the map-reduce: condenses a long text into notes within the budget.
+
+    Chunks are summarized concurrently, so latency follows the slowest chunk
+    rather than the length of the text. Notes that are still over the budget
+    are condensed again. If a round doesn't shrink them, they are cut to the
+    budget instead, so the reduce step never gets an oversized prompt.
+    """
+    semaphore = asyncio.Semaphore(settings.summary_concurrency)
+    notes = text
+    while estimate_tokens(notes) > settings.summary_token_budget:
+        chunks = split_into_chunks(notes, settings.summary_chunk_tokens)
+        reduced = "\n\n".join(
+            await _summarize_chunks(gemini, chunks, target_language, semaphore),
+        )
+        if len(reduced) >= len(notes):
+            logger.warning(
+                "Notes stopped shrinking at about %d tokens, truncating them.",
+                estimate_tokens(notes),
+            )
+            return truncate_to_tokens(notes, settings.summary_token_budget)
+        notes = reduced
+    return notes
+
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    """Cuts a text down to about the given number of tokens, between words."""
+    max_chars = tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[: max_chars + 1]
+    head, _, _ = cut.rpartition(" ")
+    return (head or cut[:max_chars]).rstrip()
+
+
+def reduce_prompt(notes: str, target_language: str) -> str:
+    """Reduce step of the map-reduce: the prompt that combines the notes."""
+    return (
+        "These are notes on consecutive parts of a video. "
+        "Summarize them so the user can understand the content of the video. "
+        "Note down the important details. Be as natural as possible. "
+        f"The summary should be in {target_language}:\n\n{notes}"
+    )
@@ -7,6 +7,12 @@ class GenerateNewsletterRequest(BaseModel):
     announcement: str | None = None
     file_url: str | None = None  # Stores extracted text from the Doc Extractor
 
+class NewsletterContent(BaseModel):
+    overview: str
+    past: str
+    future: str
+    announcement: str
+
 class GenerateLessonIntroRequest(BaseModel):
     topic: str
     audience: str
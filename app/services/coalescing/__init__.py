@@ -0,0 +1,6 @@
+"""Coalescing of identical requests in flight."""
+
+from app.services.coalescing.coalescer import Coalescer
+from app.services.coalescing.dependency import get_coalescer
+
+__all__ = ["Coalescer", "get_coalescer"]
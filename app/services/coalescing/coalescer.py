@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Delays between attempts to take a lock held by another worker, in seconds.
+_LOCK_POLL_MIN = 0.05
+_LOCK_POLL_MAX = 1.0
+
+
+class _Flight:
+    def __init__(self, task: "asyncio.Task[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class Coalescer:
+    """
+    Runs identical concurrent computations once.
+
+    Callers that ask for a key already being computed await the running
+    computation instead of starting their own, and all of them get its
+    result or its error. A computation is cancelled only once every caller
+    waiting for it has gone away.
+
+    With ``lock_dir``, a computation also takes a file lock named after
+    its key, so the same key is computed by one worker at a time. The
+    other workers wait for the lock, then compute the key themselves,
+    which is cheap by then since transcripts, Gemini responses and PDFs
+    are all cached across workers.
+    """
+
+    def __init__(
+        self,
+        lock_dir: Optional[Path] = None,
+        lock_timeout: float = 1800,
+        enabled: bool = True,
+    ) -> None:
+        if lock_dir is not None and fcntl is None:  # pragma: no cover
+            logger.warning(
+                "File locks aren't available, coalescing in the worker only.",
+            )
+            lock_dir = None
+        if lock_dir is not None:
+            lock_dir.mkdir(parents=True, exist_ok=True)
+        self.lock_dir = lock_dir
+        self.lock_timeout = lock_timeout
+        self.enabled = enabled
+        self._flights: dict[Hashable, _Flight] = {}
+        self._requests = 0
+        self._coalesced = 0
+        self._lock_waits = 0
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        """
+        Compute a key, or join the computation of the same key in flight.
+
+        :param key: normalized inputs of the computation, JSON-serializable.
+        :param compute: computes the result.
+        :return: result of the computation.
+        """
+        self._requests += 1
+        if not self.enabled:
+            return await compute()
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(self._compute(key, compute)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._land(key, flight))
+        else:
+            self._coalesced += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Nobody wants the result any more.
+                flight.task.cancel()
+                self._land(key, flight)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get coalescing counters.
+
+        :return: requests, duplicates that joined a computation in flight and
+            so saved one, the share of duplicates, and waits for other workers.
+        """
+        return {
+            "requests": self._requests,
+            "coalesced": self._coalesced,
+            "duplicate_rate": (
+                self._coalesced / self._requests if self._requests else 0.0
+            ),
+            "in_flight": len(self._flights),
+            "lock_waits": self._lock_waits,
+        }
+
+    def _land(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        if self.lock_dir is None:
+            return await compute()
+        fd = await self._lock(key)
+        try:
+            return await compute()
+        finally:
+            if fd is not None:
+                self._unlock(fd, self._lock_path(key))
+
+    def _lock_path(self, key: Hashable) -> Path:
+        payload = json.dumps(key, sort_keys=True, ensure_ascii=False, default=str)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return self.lock_dir / f"{digest[:32]}.lock"  # type: ignore[operator]
+
+    async def _lock(self, key: Hashable) -> Optional[int]:
+        path = self._lock_path(key)
+        deadline = time.monotonic() + self.lock_timeout
+        delay = _LOCK_POLL_MIN
+        waited = False
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+            else:
+                # The holder before us removes the file on release, make
+                # sure the lock is still on the file other workers will open.
+                try:
+                    if path.stat().st_ino == os.fstat(fd).st_ino:
+                        return fd
+                except FileNotFoundError:
+                    pass
+                os.close(fd)
+                continue
+            if not waited:
+                waited = True
+                self._lock_waits += 1
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    "Another worker holds %s for too long, computing anyway.",
+                    path.name,
+                )
+                return None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _LOCK_POLL_MAX)
+
+    def _unlock(self, fd: int, path: Path) -> None:
+        try:
+            path.unlink(missing_ok=True)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
@@ -0,0 +1,13 @@
+from starlette.requests import Request
+
+from app.services.coalescing.coalescer import Coalescer
+
+
+def get_coalescer(request: Request) -> Coalescer:
+    """
+    Get the request coalescer.
+
+    :param request: current request.
+    :return: coalescer stored in the application's state.
+    """
+    return request.app.state.coalescer
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from fastapi import FastAPI
+
+from app.core.settings import CoalesceMode, settings
+from app.services.coalescing.coalescer import Coalescer
+
+
+def init_coalescer(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the coalescer of identical concurrent requests.
+
+    :param app: current fastapi application.
+    """
+    lock_dir = None
+    if settings.coalesce_mode == CoalesceMode.HOST:
+        lock_dir = Path(settings.cache_dir) / "locks"
+    app.state.coalescer = Coalescer(
+        lock_dir=lock_dir,
+        lock_timeout=settings.coalesce_lock_timeout,
+        enabled=settings.coalesce_mode != CoalesceMode.OFF,
+    )
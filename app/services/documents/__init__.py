@@ -0,0 +1,17 @@
+"""Downloads of documents shared by users."""
+
+from app.services.documents.dependency import get_document_downloader
+from app.services.documents.downloader import (
+    DocumentDownloader,
+    DocumentDownloadError,
+    DocumentTooLargeError,
+    resolve_document_url,
+)
+
+__all__ = [
+    "DocumentDownloadError",
+    "DocumentDownloader",
+    "DocumentTooLargeError",
+    "get_document_downloader",
+    "resolve_document_url",
+]
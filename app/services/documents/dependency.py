@@ -0,0 +1,13 @@
+from starlette.requests import Request
+
+from app.services.documents.downloader import DocumentDownloader
+
+
+def get_document_downloader(request: Request) -> DocumentDownloader:
+    """
+    Get the document downloader.
+
+    :param request: current request.
+    :return: downloader stored in the application's state.
+    """
+    return request.app.state.document_downloader
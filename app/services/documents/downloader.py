@@ -0,0 +1,213 @@
+import io
+import re
+import tempfile
+from collections import OrderedDict
+from typing import BinaryIO, NamedTuple, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+# Drive links carry the file ID either in the path or in the ``id`` parameter.
+_DRIVE_PATH_ID = re.compile(r"/(?:file|document)/d/([\w-]{10,})")
+_DRIVE_DOWNLOAD = (
+    "https://drive.usercontent.google.com/download?id={}&export=download&confirm=t"
+)
+_DOCS_EXPORT = "https://docs.google.com/document/d/{}/export?format=docx"
+# Resolved links kept per worker.
+_RESOLVED_URLS = 1024
+
+
+class DocumentDownloadError(Exception):
+    """Raised when a document can't be downloaded."""
+
+
+class DocumentTooLargeError(DocumentDownloadError):
+    """Raised when a document is over the size limit."""
+
+
+class _CachedDocument(NamedTuple):
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+def resolve_document_url(url: str) -> tuple[str, str]:
+    """
+    Find the direct download link of a document.
+
+    Google Drive and Google Docs links are turned into their download or
+    export endpoint, so no HTML page has to be fetched and scraped.
+
+    :param url: link shared by the user.
+    :return: cache key of the document and its download link.
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname or ""
+    if host.endswith("google.com"):
+        match = _DRIVE_PATH_ID.search(parsed.path)
+        if match:
+            file_id = match.group(1)
+        else:
+            file_id = parse_qs(parsed.query).get("id", [None])[0]
+        if file_id:
+            if host == "docs.google.com" and parsed.path.startswith("/document/"):
+                return f"docs:{file_id}", _DOCS_EXPORT.format(file_id)
+            return f"drive:{file_id}", _DRIVE_DOWNLOAD.format(file_id)
+    return url, url
+
+
+class DocumentDownloader:
+    """
+    Downloads documents over the shared HTTP client.
+
+    Documents are streamed into memory, and only spill to an anonymous
+    temporary file once they grow over ``spill_bytes``, so nothing is
+    left on disk whatever happens to the request.
+
+    Downloaded documents are kept in memory by file ID, up to
+    ``cache_bytes``. Downloading one again sends its ETag or Last-Modified
+    date, so an unchanged document only costs a 304 response.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        max_bytes: int,
+        cache_bytes: int,
+        spill_bytes: int,
+        timeout: Union[httpx.Timeout, float, None] = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.cache_bytes = cache_bytes
+        self.spill_bytes = spill_bytes
+        self.timeout = timeout
+        self._client = client
+        self._resolved: OrderedDict[str, tuple[str, str]] = OrderedDict()
+        self._documents: OrderedDict[str, _CachedDocument] = OrderedDict()
+        self._cached_bytes = 0
+        self._downloads = 0
+        self._revalidations = 0
+        self._downloaded_bytes = 0
+
+    async def fetch(self, url: str) -> BinaryIO:
+        """
+        Download a document.
+
+        :param url: link shared by the user.
+        :raises DocumentTooLargeError: if the document is over the size limit.
+        :raises DocumentDownloadError: if the document can't be downloaded.
+        :return: file object with the document, to be closed by the caller.
+        """
+        key, download_url = self._resolve(url)
+        cached = self._documents.get(key)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        timeout = self.timeout if self.timeout is not None else httpx.USE_CLIENT_DEFAULT
+        try:
+            async with self._client.stream(
+                "GET",
+                download_url,
+                headers=headers,
+                timeout=timeout,
+            ) as response:
+                if response.status_code == 304 and cached is not None:
+                    self._revalidations += 1
+                    self._documents.move_to_end(key)
+                    return io.BytesIO(cached.content)
+                document, size = await self._read(response)
+        except httpx.HTTPError as error:
+            message = f"Failed to download the file: {error}"
+            raise DocumentDownloadError(message) from error
+
+        self._downloads += 1
+        self._downloaded_bytes += size
+        if isinstance(document, io.BytesIO):
+            # Still in memory, so it can be cached without reading it back.
+            self._store(
+                key,
+                _CachedDocument(
+                    content=document.getvalue(),
+                    etag=response.headers.get("etag"),
+                    last_modified=response.headers.get("last-modified"),
+                ),
+            )
+        return document
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get downloader counters.
+
+        :return: full downloads, downloads answered with 304 and cache usage.
+        """
+        return {
+            "downloads": self._downloads,
+            "revalidations": self._revalidations,
+            "downloaded_bytes": self._downloaded_bytes,
+            "cached_documents": len(self._documents),
+            "cached_bytes": self._cached_bytes,
+        }
+
+    def _resolve(self, url: str) -> tuple[str, str]:
+        resolved = self._resolved.get(url)
+        if resolved is None:
+            resolved = resolve_document_url(url)
+            self._resolved[url] = resolved
+            if len(self._resolved) > _RESOLVED_URLS:
+                self._resolved.popitem(last=False)
+        return resolved
+
+    async def _read(self, response: httpx.Response) -> tuple[BinaryIO, int]:
+        if response.status_code >= 400:
+            raise DocumentDownloadError(
+                f"Failed to download the file: HTTP {response.status_code}.",
+            )
+        if response.headers.get("content-type", "").startswith("text/html"):
+            # Drive answers with a sign-in or warning page for files that aren't public.
+            raise DocumentDownloadError(
+                "The link doesn't lead to a file, check that it is shared publicly.",
+            )
+        length = response.headers.get("content-length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            raise DocumentTooLargeError("The file is too large.")
+
+        document: BinaryIO = io.BytesIO()
+        if length and length.isdigit() and int(length) > self.spill_bytes:
+            document = tempfile.TemporaryFile()
+        try:
+            size = 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise DocumentTooLargeError("The file is too large.")
+                if size > self.spill_bytes and isinstance(document, io.BytesIO):
+                    spilled = tempfile.TemporaryFile()
+                    spilled.write(document.getbuffer())
+                    document.close()
+                    document = spilled
+                document.write(chunk)
+            if not size:
+                raise DocumentDownloadError("Downloaded file is empty.")
+        except BaseException:
+            document.close()
+            raise
+        document.seek(0)
+        return document, size
+
+    def _store(self, key: str, document: _CachedDocument) -> None:
+        previous = self._documents.pop(key, None)
+        if previous is not None:
+            self._cached_bytes -= len(previous.content)
+        if not (document.etag or document.last_modified):
+            return  # Can't be revalidated, keeping it would only use memory.
+        if len(document.content) > self.cache_bytes:
+            return
+        self._documents[key] = document
+        self._cached_bytes += len(document.content)
+        while self._cached_bytes > self.cache_bytes:
+            _, evicted = self._documents.popitem(last=False)
+            self._cached_bytes -= len(evicted.content)
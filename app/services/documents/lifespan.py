@@ -0,0 +1,23 @@
+import httpx
+from fastapi import FastAPI
+
+from app.core.settings import settings
+from app.services.documents.downloader import DocumentDownloader
+
+
+def init_documents(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the document downloader on the shared HTTP client.
+
+    :param app: current fastapi application.
+    """
+    app.state.document_downloader = DocumentDownloader(
+        client=app.state.http_client,
+        max_bytes=settings.document_max_mb * 1024 * 1024,
+        cache_bytes=settings.document_cache_mb * 1024 * 1024,
+        spill_bytes=settings.document_spill_mb * 1024 * 1024,
+        timeout=httpx.Timeout(
+            settings.document_timeout,
+            connect=settings.http_connect_timeout,
+        ),
+    )
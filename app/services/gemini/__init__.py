@@ -0,0 +1,7 @@
+"""Gemini LLM service."""
+
+from app.services.gemini.client import GeminiClient
+from app.services.gemini.dependency import get_gemini_client
+from app.services.gemini.limiter import GeminiLimiter, GeminiQuotaError
+
+__all__ = ["GeminiClient", "GeminiLimiter", "GeminiQuotaError", "get_gemini_client"]
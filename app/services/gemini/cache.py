@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Mapping, Optional
+
+from app.utils.sqlite_utils import connect_sqlite
+
+# Run a disk cleanup once every this many writes.
+_PRUNE_EVERY = 100
+
+
+class LLMCache:
+    """
+    Two-tier cache for LLM responses.
+
+    Responses are keyed by a hash of model, prompt and generation config.
+    The first tier is a bounded in-process LRU, the second one is a SQLite
+    file that all workers on the host share.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        memory_items: int,
+        memory_ttl: int,
+        disk_ttl: int,
+        disk_max_bytes: int,
+    ) -> None:
+        self.memory_items = memory_items
+        self.memory_ttl = memory_ttl
+        self.disk_ttl = disk_ttl
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "disk_evictions": 0,
+        }
+        self._db = connect_sqlite(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)",
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_accessed_at "
+            "ON llm_cache (accessed_at)",
+        )
+
+    @staticmethod
+    def make_key(
+        model_name: str,
+        prompt: str,
+        generation_config: Optional[Mapping[str, Any]] = None,
+    ) -> str:
+        """
+        Build a cache key.
+
+        :param model_name: name of the model.
+        :param prompt: prompt sent to the model.
+        :param generation_config: generation config sent to the model.
+        :return: hex digest identifying the request.
+        """
+        payload = json.dumps(
+            {
+                "model": model_name,
+                "prompt": prompt,
+                "config": generation_config or {},
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look the key up in memory first, then on disk.
+
+        :param key: cache key.
+        :return: cached response or None.
+        """
+        value = self._memory_get(key)
+        if value is not None:
+            self._counters["memory_hits"] += 1
+            return value
+        value = await asyncio.to_thread(self._disk_get, key)
+        if value is None:
+            self._counters["misses"] += 1
+            return None
+        self._counters["disk_hits"] += 1
+        self._memory_set(key, value)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """
+        Store a response in both tiers.
+
+        :param key: cache key.
+        :param value: response to store.
+        """
+        self._memory_set(key, value)
+        await asyncio.to_thread(self._disk_set, key, value)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get cache counters.
+
+        :return: hit, miss and eviction counters.
+        """
+        return {**self._counters, "memory_items": len(self._memory)}
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        with self._lock:
+            self._db.close()
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: str) -> None:
+        self._memory[key] = (time.monotonic() + self.memory_ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND created_at > ?",
+                (key, now - self.disk_ttl),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+        return row[0]
+
+    def _disk_set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._writes += 1
+            if self._writes % _PRUNE_EVERY == 0:
+                self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """Drop expired rows, then least recently used ones over the size limit."""
+        evicted = self._db.execute(
+            "DELETE FROM llm_cache WHERE created_at <= ?",
+            (now - self.disk_ttl,),
+        ).rowcount
+        (total,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM llm_cache",
+        ).fetchone()
+        if total > self.disk_max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM llm_cache ORDER BY accessed_at",
+            ).fetchall()
+            stale = []
+            for key, size in rows:
+                if total <= self.disk_max_bytes:
+                    break
+                stale.append((key,))
+                total -= size
+            self._db.executemany("DELETE FROM llm_cache WHERE key = ?", stale)
+            evicted += len(stale)
+        self._counters["disk_evictions"] += evicted
@@ -0,0 +1,247 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+import google.ai.generativelanguage as glm
+import google.generativeai as genai
+from google.api_core.client_options import ClientOptions
+from google.generativeai.types import GenerationConfigDict
+
+from app.services.gemini.cache import LLMCache
+from app.services.gemini.limiter import GeminiKey, GeminiLimiter
+
+T = TypeVar("T")
+
+# Output tokens assumed for a call that doesn't set max_output_tokens.
+_OUTPUT_TOKENS_ESTIMATE = 1024
+
+
+def estimate_call_tokens(
+    prompt: str,
+    generation_config: Optional[GenerationConfigDict],
+) -> int:
+    """
+    Estimate the tokens a call will use, before it is sent.
+
+    :param prompt: prompt of the call.
+    :param generation_config: optional generation config.
+    :return: about four characters per prompt token, plus the expected output.
+    """
+    config = generation_config or {}
+    output = config.get("max_output_tokens", _OUTPUT_TOKENS_ESTIMATE)
+    return len(prompt) // 4 + output
+
+
+def _chunk_text(chunk: Any) -> str:
+    # chunk.text raises on chunks without text parts, such as a blocked
+    # chunk or a last one that only carries the finish reason.
+    candidates = chunk.candidates
+    if not candidates:
+        return ""
+    return "".join(part.text for part in candidates[0].content.parts)
+
+
+def _used_tokens(response: Any) -> Optional[int]:
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", None) or None
+
+
+class GeminiClient:
+    """
+    Shared asynchronous client for the Gemini API.
+
+    One instance lives on ``app.state`` for the whole life of a worker.
+    ``GenerativeModel`` objects are created once per model name and API
+    key and reused, so their underlying gRPC channels (and connections)
+    are reused as well. Every key gets its own channel, instead of the one
+    ``genai.configure`` sets for the whole process, so several keys can be
+    used side by side. Calls go through ``generate_content_async`` and never
+    hold a thread. Responses are served from the cache, when one is given,
+    and calls go through the limiter, when one is given, which picks their
+    key, bounds the calls in flight, keeps them under the quota and retries
+    the throttled ones.
+    """
+
+    def __init__(
+        self,
+        default_model: str,
+        cache: Optional[LLMCache] = None,
+        limiter: Optional[GeminiLimiter] = None,
+    ) -> None:
+        self.default_model = default_model
+        self.cache = cache
+        self.limiter = limiter
+        self._models: dict[tuple[str, Optional[str]], genai.GenerativeModel] = {}
+        self._clients: dict[str, glm.GenerativeServiceAsyncClient] = {}
+
+    def get_model(
+        self,
+        model_name: Optional[str] = None,
+        key: Optional[GeminiKey] = None,
+    ) -> genai.GenerativeModel:
+        """
+        Get a cached model object.
+
+        :param model_name: name of the model, defaults to the configured model.
+        :param key: API key the model calls with, the library's default one if None.
+        :return: generative model.
+        """
+        model_name = model_name or self.default_model
+        api_key = key.api_key if key is not None else None
+        model = self._models.get((model_name, api_key))
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            if api_key is not None:
+                # The model keeps the client it's given instead of the global
+                # one. There is no public way to pass it, so google-generativeai
+                # is pinned to 0.8 for this attribute.
+                client: Any = self._client(api_key)
+                model._async_client = client  # noqa: SLF001
+            self._models[(model_name, api_key)] = model
+        return model
+
+    async def generate(
+        self,
+        prompt: str,
+        model_name: Optional[str] = None,
+        generation_config: Optional[GenerationConfigDict] = None,
+        validate: Optional[Callable[[str], Any]] = None,
+    ) -> str:
+        """
+        Generate text for the prompt.
+
+        :param prompt: prompt to send to the model.
+        :param model_name: name of the model, defaults to the configured model.
+        :param generation_config: optional generation config.
+        :param validate: optional check of the generated text, raising if it
+            can't be used, so that an unusable response is never cached.
+        :return: generated text.
+        """
+        model = self.get_model(model_name)
+        cache = self.cache
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(model.model_name, prompt, generation_config)
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                return cached
+        estimated = estimate_call_tokens(prompt, generation_config)
+
+        async def call(key: Optional[GeminiKey]) -> Any:
+            response = await self.get_model(model_name, key).generate_content_async(
+                prompt,
+                generation_config=generation_config,
+            )
+            self._record_usage(key, estimated, response)
+            return response
+
+        response = await self._call(call, estimated)
+        text = response.text
+        if validate is not None:
+            validate(text)
+        if cache is not None and cache_key is not None:
+            await cache.set(cache_key, text)
+        return text
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        model_name: Optional[str] = None,
+        generation_config: Optional[GenerationConfigDict] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Generate text for the prompt, yielding it as the model streams it.
+
+        A cached response is yielded whole, and a streamed one is cached
+        once it is complete.
+
+        :param prompt: prompt to send to the model.
+        :param model_name: name of the model, defaults to the configured model.
+        :param generation_config: optional generation config.
+        :yield: pieces of the generated text.
+        """
+        model = self.get_model(model_name)
+        cache = self.cache
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(model.model_name, prompt, generation_config)
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        async def start_stream(
+            key: Optional[GeminiKey],
+        ) -> tuple[Optional[GeminiKey], Any, AsyncIterator[Any], list[Any]]:
+            # Throttling shows up before the first chunk, so only
+            # that part is retried.
+            response = await self.get_model(model_name, key).generate_content_async(
+                prompt,
+                generation_config=generation_config,
+                stream=True,
+            )
+            chunks = response.__aiter__()
+            try:
+                return key, response, chunks, [await chunks.__anext__()]
+            except StopAsyncIteration:
+                return key, response, chunks, []
+
+        estimated = estimate_call_tokens(prompt, generation_config)
+        # The limiter's slot is released once the stream has started, the
+        # rest of it is read at the pace of the caller.
+        key, response, chunks, first = await self._call(start_stream, estimated)
+        parts = []
+        for chunk in first:
+            text = _chunk_text(chunk)
+            if text:
+                parts.append(text)
+                yield text
+        async for chunk in chunks:
+            text = _chunk_text(chunk)
+            if text:
+                parts.append(text)
+                yield text
+        self._record_usage(key, estimated, response)
+        if cache is not None and cache_key is not None:
+            await cache.set(cache_key, "".join(parts))
+
+    def stats(self) -> Optional[dict[str, Any]]:
+        """
+        Get limiter counters.
+
+        :return: counters of the limiter, None without one.
+        """
+        return self.limiter.stats() if self.limiter is not None else None
+
+    async def close(self) -> None:
+        """Close the gRPC channels of the API keys."""
+        for client in self._clients.values():
+            await client.transport.close()
+        self._clients.clear()
+        self._models.clear()
+
+    def _client(self, api_key: str) -> glm.GenerativeServiceAsyncClient:
+        client = self._clients.get(api_key)
+        if client is None:
+            client = glm.GenerativeServiceAsyncClient(
+                client_options=ClientOptions(api_key=api_key),
+            )
+            self._clients[api_key] = client
+        return client
+
+    async def _call(
+        self,
+        func: Callable[[Optional[GeminiKey]], Awaitable[T]],
+        estimated: int,
+    ) -> T:
+        if self.limiter is None:
+            return await func(None)
+        return await self.limiter.call(func, estimated)
+
+    def _record_usage(
+        self,
+        key: Optional[GeminiKey],
+        estimated: int,
+        response: Any,
+    ) -> None:
+        used = _used_tokens(response)
+        if self.limiter is not None and key is not None and used is not None:
+            self.limiter.record_usage(key, estimated, used)
@@ -0,0 +1,13 @@
+from starlette.requests import Request
+
+from app.services.gemini.client import GeminiClient
+
+
+def get_gemini_client(request: Request) -> GeminiClient:
+    """
+    Get the shared Gemini client.
+
+    :param request: current request.
+    :return: Gemini client stored in the application's state.
+    """
+    return request.app.state.gemini_client
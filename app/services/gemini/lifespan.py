@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from fastapi import FastAPI
+
+from app.core.settings import settings
+from app.services.gemini.cache import LLMCache
+from app.services.gemini.client import GeminiClient
+from app.services.gemini.limiter import GeminiLimiter
+
+
+def _worker_share(limit: int, workers: int) -> int:
+    """
+    Splits a quota between the workers.
+
+    :param limit: quota of each key, 0 for no limit.
+    :param workers: number of workers.
+    :return: quota of each worker, at least 1 unless there is no limit.
+    """
+    if limit <= 0:
+        return 0
+    return max(limit // workers, 1)
+
+
+def init_gemini(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the shared Gemini client, its response cache and its rate limiter.
+
+    :param app: current fastapi application.
+    """
+    cache = None
+    if settings.llm_cache_enabled:
+        cache = LLMCache(
+            path=Path(settings.cache_dir) / "llm_cache.sqlite3",
+            memory_items=settings.llm_cache_memory_items,
+            memory_ttl=settings.llm_cache_memory_ttl,
+            disk_ttl=settings.llm_cache_disk_ttl,
+            disk_max_bytes=settings.llm_cache_disk_max_mb * 1024 * 1024,
+        )
+    app.state.llm_cache = cache
+    workers = max(settings.workers_count, 1)
+    limiter = GeminiLimiter(
+        keys=settings.gemini_api_keys,
+        rpm=_worker_share(settings.gemini_rpm, workers),
+        tpm=_worker_share(settings.gemini_tpm, workers),
+        min_concurrency=settings.gemini_min_concurrency,
+        max_concurrency=settings.gemini_max_concurrency,
+        max_retries=settings.gemini_max_retries,
+        backoff_base=settings.gemini_backoff_base,
+        backoff_max=settings.gemini_backoff_max,
+    )
+    app.state.gemini_client = GeminiClient(
+        default_model=settings.gemini_model,
+        cache=cache,
+        limiter=limiter,
+    )
+
+
+async def shutdown_gemini(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Closes the connections of the API keys and the response cache.
+
+    :param app: current fastapi application.
+    """
+    await app.state.gemini_client.close()
+    if app.state.llm_cache is not None:
+        app.state.llm_cache.close()
@@ -0,0 +1,394 @@
+import asyncio
+import logging
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable, Optional, Sequence, TypeVar
+
+from google.api_core import exceptions as google_exceptions
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Errors that mean the quota or the service is saturated, and a later try may succeed.
+THROTTLING_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+)
+_RETRY_HINT = re.compile(
+    r"retry_delay\s*\{\s*seconds:\s*(\d+)|retry in ([\d.]+)\s*s",
+    re.IGNORECASE,
+)
+
+
+class GeminiQuotaError(Exception):
+    """Raised when Gemini keeps throttling a call after every retry."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Find how long the API asked to wait before trying again.
+
+    :param error: error raised by the API.
+    :return: seconds to wait, None if the error has no hint.
+    """
+    for detail in getattr(error, "details", None) or ():
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            seconds = delay.seconds + delay.nanos / 1e9
+            if seconds > 0:
+                return seconds
+    response = getattr(error, "response", None)
+    header = getattr(response, "headers", {}).get("retry-after") if response else None
+    if header:
+        try:
+            return max(float(header), 0.0)
+        except ValueError:
+            pass  # An HTTP date, never sent by Gemini.
+    match = _RETRY_HINT.search(str(error))
+    if match:
+        return float(match.group(1) or match.group(2))
+    return None
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at a steady rate, holding at most a minute of it.
+
+    Waiters are served in order, so a large request isn't starved by
+    small ones.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float) -> float:
+        """
+        Take tokens out of the bucket, waiting for them if needed.
+
+        :param amount: tokens to take, capped to the capacity.
+        :return: seconds waited.
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def available(self) -> float:
+        """
+        Get the tokens in the bucket right now.
+
+        :return: tokens, negative while the bucket is in debt.
+        """
+        self._refill()
+        return self._tokens
+
+    def adjust(self, amount: float) -> None:
+        """
+        Take tokens that were used on top of an estimate, or give back unused ones.
+
+        :param amount: tokens to take, negative to give them back.
+        """
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        refilled = self._tokens + (now - self._updated) * self.rate
+        self._tokens = min(self.capacity, refilled)
+        self._updated = now
+
+
+class AimdController:
+    """
+    Concurrency limit that adapts to throttling.
+
+    The limit grows by about one for every limit's worth of successful
+    calls, and is halved when a call is throttled. Calls that started
+    before the last decrease can't decrease it again, so one burst of
+    throttling halves the limit once.
+    """
+
+    def __init__(self, minimum: int, maximum: int, decrease: float = 0.5) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.limit = float(maximum)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._decreases = 0
+        self._waiters: list[asyncio.Future[None]] = []
+
+    async def acquire(self) -> float:
+        """
+        Wait for a free slot and take it.
+
+        :return: time the slot was taken, to be passed to ``release``.
+        """
+        while self._in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_flight += 1
+        return time.monotonic()
+
+    @property
+    def in_flight(self) -> int:
+        """Calls holding a slot."""
+        return self._in_flight
+
+    def release(self, started: float, throttled: Optional[bool]) -> None:
+        """
+        Give a slot back and adapt the limit to how the call went.
+
+        :param started: time the slot was taken.
+        :param throttled: whether the call was throttled, None if it failed otherwise.
+        """
+        self._in_flight -= 1
+        if throttled:
+            if started >= self._last_decrease:
+                self.limit = max(float(self.minimum), self.limit * self.decrease)
+                self._last_decrease = time.monotonic()
+                self._decreases += 1
+        elif throttled is not None:
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get controller counters.
+
+        :return: current limit, calls in flight and times the limit was cut.
+        """
+        return {
+            "concurrency_limit": int(self.limit),
+            "in_flight": self._in_flight,
+            "limit_decreases": self._decreases,
+        }
+
+
+class GeminiKey:
+    """
+    API key of a Gemini project, with the quota state of that project.
+
+    Every project has its own quota, so every key gets its own buckets and
+    concurrency controller, and cools down on its own when it's throttled.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        rpm: int,
+        tpm: int,
+        min_concurrency: int,
+        max_concurrency: int,
+    ) -> None:
+        self.api_key = api_key
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.concurrency = AimdController(min_concurrency, max_concurrency)
+        self.cooling_until = 0.0
+        self.calls = 0
+        self.throttled = 0
+
+    @property
+    def label(self) -> str:
+        """Name of the key that is safe to show, its last characters."""
+        return f"...{self.api_key[-4:]}" if self.api_key else "default"
+
+    def headroom(self) -> float:
+        """
+        Get the share of the key's quota that is left right now.
+
+        :return: from 0 for a drained key to 1 for an idle one.
+        """
+        shares = [1 - self.concurrency.in_flight / max(self.concurrency.limit, 1)]
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                shares.append(bucket.available() / bucket.capacity)
+        return min(shares)
+
+    async def admit(self, tokens: int) -> tuple[float, float]:
+        """
+        Wait for the key's buckets, then for a slot of its concurrency controller.
+
+        :param tokens: estimated tokens of the call.
+        :return: seconds waited for the buckets, and the time the slot was taken.
+        """
+        waited = 0.0
+        if self.requests is not None:
+            waited += await self.requests.acquire(1)
+        if self.tokens is not None:
+            waited += await self.tokens.acquire(tokens)
+        return waited, await self.concurrency.acquire()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get key counters.
+
+        :return: calls, throttled attempts, cooldown and concurrency state of the key.
+        """
+        return {
+            "key": self.label,
+            "calls": self.calls,
+            "throttled": self.throttled,
+            "cooling_down": self.cooling_until > time.monotonic(),
+            **self.concurrency.stats(),
+        }
+
+
+class GeminiLimiter:
+    """
+    Admission control, key rotation and retries for Gemini calls.
+
+    Every call is sent with the key that has the most quota left among the
+    keys that aren't cooling down. It then waits for that key's
+    requests-per-minute and tokens-per-minute buckets and for a slot of
+    its AIMD concurrency controller.
+
+    A throttled key cools down for as long as the API asked, or for an
+    exponential backoff with full jitter. The call is retried right away
+    with another key if one is available, otherwise once the first key
+    is back.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[Optional[str]],
+        rpm: int,
+        tpm: int,
+        min_concurrency: int,
+        max_concurrency: int,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+    ) -> None:
+        self.keys = [
+            GeminiKey(api_key, rpm, tpm, min_concurrency, max_concurrency)
+            for api_key in (keys or [None])
+        ]
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._counters = {
+            "calls": 0,
+            "throttled": 0,
+            "retries": 0,
+            "quota_errors": 0,
+        }
+        self._waited = 0.0
+
+    async def call(self, func: Callable[[GeminiKey], Awaitable[T]], tokens: int) -> T:
+        """
+        Run a Gemini call once admitted, retrying it while it is throttled.
+
+        :param func: makes the call with the given key.
+        :param tokens: estimated tokens of the call, see ``record_usage``.
+        :raises GeminiQuotaError: if the call is still throttled after every retry.
+        :return: result of the call.
+        """
+        self._counters["calls"] += 1
+        attempt = 0
+        while True:
+            key = await self._pick()
+            waited, started = await key.admit(tokens)
+            self._waited += waited
+            key.calls += 1
+            try:
+                result = await func(key)
+            except THROTTLING_ERRORS as error:
+                key.concurrency.release(started, throttled=True)
+                key.throttled += 1
+                self._counters["throttled"] += 1
+                hint = retry_after(error)
+                delay = self._backoff(attempt, hint)
+                key.cooling_until = max(key.cooling_until, time.monotonic() + delay)
+                # Wait for a key to come back only as long as a backoff would.
+                waited_out = self._retry_after() > self.backoff_max
+                if attempt >= self.max_retries or waited_out:
+                    self._counters["quota_errors"] += 1
+                    raise GeminiQuotaError(
+                        f"Gemini is over its quota, try again later: {error}",
+                        retry_after=self._retry_after(),
+                    ) from error
+                logger.warning("Gemini throttled key %s for %.1fs.", key.label, delay)
+                self._counters["retries"] += 1
+                attempt += 1
+                continue
+            except BaseException:
+                key.concurrency.release(started, throttled=None)
+                raise
+            key.concurrency.release(started, throttled=False)
+            return result
+
+    def record_usage(self, key: GeminiKey, estimated: int, used: int) -> None:
+        """
+        Correct a key's tokens bucket once a call reports its real usage.
+
+        :param key: key the call was sent with.
+        :param estimated: tokens the call was admitted with.
+        :param used: tokens the call used.
+        """
+        if key.tokens is not None:
+            key.tokens.adjust(used - estimated)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get limiter counters.
+
+        :return: calls, throttled attempts, retries, calls failed on quota,
+            seconds spent waiting for the buckets or for cooldowns, and the
+            state of every key.
+        """
+        return {
+            **self._counters,
+            "waited_seconds": round(self._waited, 3),
+            "keys": [key.stats() for key in self.keys],
+        }
+
+    async def _pick(self) -> GeminiKey:
+        now = time.monotonic()
+        ready = [key for key in self.keys if key.cooling_until <= now]
+        if not ready:
+            key = min(self.keys, key=lambda key: key.cooling_until)
+            pause = key.cooling_until - now
+            await asyncio.sleep(pause)
+            self._waited += pause
+            return key
+        return max(ready, key=lambda key: key.headroom())
+
+    def _retry_after(self) -> float:
+        # The client may try again once the first key is back.
+        now = time.monotonic()
+        return max(min(key.cooling_until for key in self.keys) - now, 0.0)
+
+    def _backoff(self, attempt: int, hint: Optional[float]) -> float:
+        if hint is not None:
+            # Spread the retries of everyone who got the same hint.
+            return hint + random.uniform(0, self.backoff_base)  # noqa: S311
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, ceiling)  # noqa: S311
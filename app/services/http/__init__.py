@@ -0,0 +1,15 @@
+"""HTTP client shared by all outgoing requests."""
+
+from app.services.http.client import (
+    CachingNetworkBackend,
+    HostLimitedTransport,
+    create_http_client,
+)
+from app.services.http.dependency import get_http_client
+
+__all__ = [
+    "CachingNetworkBackend",
+    "HostLimitedTransport",
+    "create_http_client",
+    "get_http_client",
+]
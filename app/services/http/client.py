@@ -0,0 +1,260 @@
+import asyncio
+import socket
+import time
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+import anyio
+import httpcore
+import httpx
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover
+    HTTP2_AVAILABLE = False
+else:  # pragma: no cover
+    HTTP2_AVAILABLE = True
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that caches DNS lookups.
+
+    Connections are opened to a cached address of the host for ``ttl``
+    seconds, trying the others if it doesn't answer. TLS still verifies
+    the hostname, so only the lookup is skipped.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        backend: Optional[httpcore.AsyncNetworkBackend] = None,
+    ) -> None:
+        self.ttl = ttl
+        self._backend = backend or httpcore.AnyIOBackend()
+        self._addresses: dict[tuple[str, int], tuple[float, list[str]]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """
+        Opens a connection to a cached address of the host.
+
+        :param host: host name or address.
+        :param port: port.
+        :param timeout: seconds to wait for each address.
+        :param local_address: address to connect from.
+        :param socket_options: options set on the socket.
+        :raises ConnectError: if no address of the host answers.
+        :return: connection.
+        """
+        addresses = await self._resolve(host, port)
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as connect_error:
+                error = connect_error
+        # Every cached address failed, the host may have moved.
+        self._addresses.pop((host, port), None)
+        raise error or httpcore.ConnectError(f"No address found for {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:  # pragma: no cover
+        """
+        Opens a connection to a Unix socket, no lookup is needed.
+
+        :param path: path of the socket.
+        :param timeout: seconds to wait for the connection.
+        :param socket_options: options set on the socket.
+        :return: connection.
+        """
+        return await self._backend.connect_unix_socket(
+            path,
+            timeout=timeout,
+            socket_options=socket_options,
+        )
+
+    async def sleep(self, seconds: float) -> None:  # pragma: no cover
+        """
+        Sleeps with the wrapped backend.
+
+        :param seconds: seconds to sleep.
+        """
+        await self._backend.sleep(seconds)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get DNS cache counters.
+
+        :return: lookups answered from the cache and sent to the resolver.
+        """
+        return {"dns_hits": self._hits, "dns_misses": self._misses}
+
+    async def _resolve(self, host: str, port: int) -> list[str]:
+        cached = self._addresses.get((host, port))
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            self._hits += 1
+            return cached[1]
+        self._misses += 1
+        try:
+            infos = await anyio.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as error:
+            raise httpcore.ConnectError(str(error)) from error
+        addresses = list(dict.fromkeys(str(info[4][0]) for info in infos))
+        self._addresses[(host, port)] = (now + self.ttl, addresses)
+        return addresses
+
+
+class _HostSlots:
+    def __init__(self, limit: int) -> None:
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        release: Callable[[], None],
+    ) -> None:
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that limits the requests in flight to each host.
+
+    A request holds its host's slot until its response is closed, so a
+    slow host can't take the whole connection pool from the others.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int) -> None:
+        self.max_per_host = max_per_host
+        self._transport = transport
+        self._hosts: dict[tuple[bytes, str, Optional[int]], _HostSlots] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """
+        Sends a request once its host has a free slot.
+
+        :param request: request to send.
+        :raises TypeError: if the wrapped transport returns a synchronous stream.
+        :return: response, releasing the slot when it's closed.
+        """
+        key = (request.url.raw_scheme, request.url.host, request.url.port)
+        slots = self._hosts.get(key)
+        if slots is None:
+            slots = self._hosts[key] = _HostSlots(self.max_per_host)
+        slots.users += 1
+        try:
+            await slots.semaphore.acquire()
+        except BaseException:
+            self._leave(key, slots)
+            raise
+
+        def release() -> None:
+            slots.semaphore.release()
+            self._leave(key, slots)
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        if not isinstance(response.stream, httpx.AsyncByteStream):
+            release()
+            raise TypeError("The wrapped transport returned a synchronous stream.")
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        """Closes the wrapped transport and its connections."""
+        await self._transport.aclose()
+
+    def _leave(self, key: tuple[bytes, str, Optional[int]], slots: _HostSlots) -> None:
+        slots.users -= 1
+        if not slots.users:
+            del self._hosts[key]
+
+
+def create_http_client(
+    timeout: float,
+    connect_timeout: float,
+    max_connections: int,
+    max_keepalive: int,
+    max_per_host: int,
+    keepalive_expiry: float,
+    dns_ttl: float,
+    http2: bool = True,
+) -> httpx.AsyncClient:
+    """
+    Create the HTTP client shared by all outgoing requests.
+
+    Connections are kept alive and reused, over HTTP/2 when the server and
+    the h2 package allow it, so most requests skip the TCP and TLS
+    handshakes. DNS lookups are cached for ``dns_ttl`` seconds.
+
+    :param timeout: seconds to wait for a response, or for writing or reading it.
+    :param connect_timeout: seconds to wait for a connection.
+    :param max_connections: connections open at the same time.
+    :param max_keepalive: idle connections kept open.
+    :param max_per_host: requests in flight to the same host.
+    :param keepalive_expiry: seconds an idle connection is kept open.
+    :param dns_ttl: seconds a DNS lookup is reused, 0 disables the cache.
+    :param http2: use HTTP/2 if the h2 package is installed.
+    :return: client, to be closed on shutdown.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        http2=http2 and HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        retries=1,
+    )
+    if dns_ttl > 0:
+        # httpx has no option for the network backend, so it's set on the
+        # httpcore pool directly. httpcore is pinned to 1.0 for this attribute.
+        pool = transport._pool  # noqa: SLF001
+        pool._network_backend = CachingNetworkBackend(dns_ttl)  # noqa: SLF001
+    return httpx.AsyncClient(
+        transport=HostLimitedTransport(transport, max_per_host),
+        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        follow_redirects=True,
+    )
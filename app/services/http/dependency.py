@@ -0,0 +1,12 @@
+import httpx
+from starlette.requests import Request
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client.
+
+    :param request: current request.
+    :return: client stored in the application's state.
+    """
+    return request.app.state.http_client
@@ -0,0 +1,31 @@
+from fastapi import FastAPI
+
+from app.core.settings import settings
+from app.services.http.client import create_http_client
+
+
+def init_http_client(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the HTTP client shared by all outgoing requests.
+
+    :param app: current fastapi application.
+    """
+    app.state.http_client = create_http_client(
+        timeout=settings.http_timeout,
+        connect_timeout=settings.http_connect_timeout,
+        max_connections=settings.http_max_connections,
+        max_keepalive=settings.http_max_keepalive,
+        max_per_host=settings.http_max_per_host,
+        keepalive_expiry=settings.http_keepalive_expiry,
+        dns_ttl=settings.http_dns_ttl,
+        http2=settings.http2,
+    )
+
+
+async def shutdown_http_client(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Closes the shared HTTP client and its connections.
+
+    :param app: current fastapi application.
+    """
+    await app.state.http_client.aclose()
@@ -0,0 +1,6 @@
+"""Background execution of long-running tool calls."""
+
+from app.services.jobs.dependency import get_job_manager
+from app.services.jobs.manager import JobManager, JobQueueFullError, JobStatus
+
+__all__ = ["JobManager", "JobQueueFullError", "JobStatus", "get_job_manager"]
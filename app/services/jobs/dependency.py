@@ -0,0 +1,13 @@
+from starlette.requests import Request
+
+from app.services.jobs.manager import JobManager
+
+
+def get_job_manager(request: Request) -> JobManager:
+    """
+    Get the background job manager.
+
+    :param request: current request.
+    :return: job manager from the application's state.
+    """
+    return request.app.state.job_manager
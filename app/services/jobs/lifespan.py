@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from fastapi import FastAPI
+
+from app.core.settings import settings
+from app.services.jobs.manager import JobManager
+
+
+def init_jobs(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts the background job executor.
+
+    :param app: current fastapi application.
+    """
+    manager = JobManager(
+        path=Path(settings.cache_dir) / "jobs.sqlite3",
+        workers=settings.job_workers,
+        queue_size=settings.job_queue_size,
+        result_ttl=settings.job_result_ttl,
+    )
+    manager.start()
+    app.state.job_manager = manager
+
+
+async def shutdown_jobs(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Stops the background job executor.
+
+    :param app: current fastapi application.
+    """
+    await app.state.job_manager.shutdown()
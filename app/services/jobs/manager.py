@@ -0,0 +1,275 @@
+import asyncio
+import enum
+import json
+import logging
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+
+from app.utils.sqlite_utils import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+JobFunction = Callable[[], Awaitable[Any]]
+
+# Error of the jobs that were running or queued when the executor stopped.
+_INTERRUPTED = {
+    "status_code": 503,
+    "detail": "The server stopped before the job finished, submit it again.",
+}
+
+
+class JobStatus(str, enum.Enum):
+    """Possible states of a job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+# States of the jobs that are done, and expire after the result TTL.
+_FINISHED = (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value)
+
+
+class JobQueueFullError(Exception):
+    """Raised when no more jobs can be queued."""
+
+
+class JobManager:
+    """
+    Bounded background executor for long-running pipelines.
+
+    Jobs are queued in memory and run by ``workers`` tasks on the event
+    loop of the worker that accepted them. Their state and results live
+    in a SQLite file, so any worker can answer a status request.
+    Finished jobs are dropped ``result_ttl`` seconds after they finish,
+    pending and running ones are kept however long they take.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        workers: int,
+        queue_size: int,
+        result_ttl: int,
+    ) -> None:
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self._queue: asyncio.Queue[tuple[str, JobFunction]] = asyncio.Queue(
+            maxsize=queue_size,
+        )
+        self._tasks: list[asyncio.Task[None]] = []
+        self._running = 0
+        self._current: set[str] = set()
+        self._lock = threading.Lock()
+        self._db = connect_sqlite(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, "
+            "kind TEXT NOT NULL, "
+            "status TEXT NOT NULL, "
+            "result TEXT, "
+            "error TEXT, "
+            "created_at REAL NOT NULL, "
+            "updated_at REAL NOT NULL)",
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at)",
+        )
+
+    def start(self) -> None:
+        """Start the worker tasks."""
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def shutdown(self) -> None:
+        """
+        Stop the worker tasks and close the database.
+
+        Running jobs are cancelled, and they and the queued jobs are marked
+        failed, so clients polling them don't wait for them forever.
+        """
+        interrupted = list(self._current)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        while not self._queue.empty():
+            job_id, _ = self._queue.get_nowait()
+            interrupted.append(job_id)
+        if interrupted:
+            logger.warning("Stopped with %d unfinished jobs.", len(interrupted))
+            await asyncio.to_thread(self._interrupt, interrupted)
+        with self._lock:
+            self._db.close()
+
+    async def submit(self, kind: str, func: JobFunction) -> str:
+        """
+        Queue a job.
+
+        :param kind: name of the pipeline, reported with the job.
+        :param func: coroutine function that runs the pipeline and returns
+            a JSON-serializable result.
+        :raises JobQueueFullError: if the queue is full.
+        :return: ID of the job.
+        """
+        if self._queue.full():
+            raise JobQueueFullError("Too many jobs are waiting, try again later.")
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self._insert, job_id, kind)
+        try:
+            self._queue.put_nowait((job_id, func))
+        except asyncio.QueueFull:
+            await self._finish(
+                job_id,
+                JobStatus.FAILED,
+                error={"status_code": 503, "detail": "Job queue is full."},
+            )
+            raise JobQueueFullError(
+                "Too many jobs are waiting, try again later.",
+            ) from None
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        """
+        Get the state of a job.
+
+        :param job_id: ID of the job.
+        :return: job state and result, or None if unknown or expired.
+        """
+        return await asyncio.to_thread(self._select, job_id)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get executor counters.
+
+        :return: number of workers, queued and running jobs.
+        """
+        return {
+            "workers": self.workers,
+            "queued_jobs": self._queue.qsize(),
+            "running_jobs": self._running,
+        }
+
+    async def _work(self) -> None:
+        while True:
+            job_id, func = await self._queue.get()
+            self._running += 1
+            self._current.add(job_id)
+            try:
+                await self._run(job_id, func)
+            finally:
+                self._running -= 1
+                self._current.discard(job_id)
+                self._queue.task_done()
+
+    async def _run(self, job_id: str, func: JobFunction) -> None:
+        await asyncio.to_thread(self._update, job_id, JobStatus.RUNNING, None, None)
+        try:
+            result = await func()
+        except HTTPException as http_error:
+            await self._finish(
+                job_id,
+                JobStatus.FAILED,
+                error={
+                    "status_code": http_error.status_code,
+                    "detail": http_error.detail,
+                },
+            )
+        except Exception as error:
+            logger.exception("Job %s failed.", job_id)
+            await self._finish(
+                job_id,
+                JobStatus.FAILED,
+                error={"status_code": 500, "detail": f"Unexpected error: {error}"},
+            )
+        else:
+            await self._finish(job_id, JobStatus.SUCCEEDED, result=result)
+
+    async def _finish(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Any = None,
+        error: Optional[dict[str, Any]] = None,
+    ) -> None:
+        await asyncio.to_thread(
+            self._update,
+            job_id,
+            status,
+            json.dumps(result) if result is not None else None,
+            json.dumps(error) if error is not None else None,
+        )
+
+    def _insert(self, job_id: str, kind: str) -> None:
+        now = time.time()
+        with self._lock:
+            # Expired jobs are dropped whenever a new one comes in.
+            self._db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (*_FINISHED, now - self.result_ttl),
+            )
+            self._db.execute(
+                "INSERT INTO jobs (id, kind, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, JobStatus.PENDING.value, now, now),
+            )
+
+    def _update(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Optional[str],
+        error: Optional[str],
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? "
+                "WHERE id = ?",
+                (status.value, result, error, time.time(), job_id),
+            )
+
+    def _interrupt(self, job_ids: list[str]) -> None:
+        error = json.dumps(_INTERRUPTED)
+        now = time.time()
+        with self._lock:
+            # A job that finished while the workers were stopping keeps its result.
+            self._db.executemany(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE id = ? AND status IN (?, ?)",
+                [
+                    (
+                        JobStatus.FAILED.value,
+                        error,
+                        now,
+                        job_id,
+                        JobStatus.PENDING.value,
+                        JobStatus.RUNNING.value,
+                    )
+                    for job_id in job_ids
+                ],
+            )
+
+    def _select(self, job_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT kind, status, result, error, created_at, updated_at "
+                "FROM jobs WHERE id = ? "
+                "AND (status NOT IN (?, ?) OR updated_at >= ?)",
+                (job_id, *_FINISHED, time.time() - self.result_ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        kind, status, result, error, created_at, updated_at = row
+        return {
+            "job_id": job_id,
+            "kind": kind,
+            "status": status,
+            "result": json.loads(result) if result is not None else None,
+            "error": json.loads(error) if error is not None else None,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
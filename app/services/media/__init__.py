@@ -0,0 +1,7 @@
+"""Store for generated files served to clients."""
+
+from app.services.media.dependency import get_media_store
+from app.services.media.files import MediaFiles
+from app.services.media.store import MediaStore
+
+__all__ = ["MediaFiles", "MediaStore", "get_media_store"]
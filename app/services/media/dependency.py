@@ -0,0 +1,13 @@
+from starlette.requests import Request
+
+from app.services.media.store import MediaStore
+
+
+def get_media_store(request: Request) -> MediaStore:
+    """
+    Get the media store.
+
+    :param request: current request.
+    :return: store kept in the application's state.
+    """
+    return request.app.state.media_store
@@ -0,0 +1,236 @@
+import os
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from app.utils.media_utils import media_digest
+
+# Generated files never change under their name, clients may keep them for a year.
+_IMMUTABLE = "public, max-age=31536000, immutable"
+_REVALIDATE = "no-cache"
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+# Downloads refresh a file's last use at most this often, see MediaStore.touch.
+_TOUCH_INTERVAL = 3600
+
+
+class RangeNotSatisfiableError(Exception):
+    """Raised when a requested byte range starts past the end of the file."""
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single byte range.
+
+    Multiple ranges and malformed headers are ignored, which the HTTP
+    spec allows, and the whole file is sent instead.
+
+    :param header: value of the Range header.
+    :param size: size of the file.
+    :raises RangeNotSatisfiableError: if the range is outside the file.
+    :return: first and last byte of the range, None for the whole file.
+    """
+    match = _RANGE.fullmatch(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range, the last bytes of the file.
+        length = int(last)
+        if not length:
+            raise RangeNotSatisfiableError
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiableError
+    if start > end:
+        return None
+    return start, end
+
+
+class MediaFileResponse(FileResponse):
+    """
+    File response that can send a part of the file.
+
+    The body is handed to the server for a zero-copy send when it
+    supports the ASGI zerocopysend or pathsend extensions.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        stat_result: os.stat_result,
+        headers: dict[str, str],
+        byte_range: Optional[tuple[int, int]] = None,
+        status_code: int = 200,
+    ) -> None:
+        self.offset = 0
+        self.count = stat_result.st_size
+        self.partial = byte_range is not None
+        if byte_range is not None:
+            start, end = byte_range
+            self.offset = start
+            self.count = end - start + 1
+            status_code = 206
+            headers = {
+                **headers,
+                "content-length": str(self.count),
+                "content-range": f"bytes {start}-{end}/{stat_result.st_size}",
+            }
+        super().__init__(
+            path,
+            status_code=status_code,
+            headers=headers,
+            stat_result=stat_result,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Send the file, or the requested range of it.
+
+        The body is handed to the server when it supports zero-copy or path
+        sends, and read in chunks otherwise.
+
+        :param scope: ASGI scope.
+        :param receive: ASGI receive channel.
+        :param send: ASGI send channel.
+        """
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            },
+        )
+        extensions = scope.get("extensions", {})
+        if scope["method"].upper() == "HEAD" or not self.count:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif "http.response.zerocopysend" in extensions:
+            file = await anyio.to_thread.run_sync(open, self.path, "rb")
+            try:
+                await send(
+                    {
+                        "type": "http.response.zerocopysend",
+                        "file": file,
+                        "offset": self.offset,
+                        "count": self.count,
+                        "more_body": False,
+                    },
+                )
+            finally:
+                await anyio.to_thread.run_sync(file.close)
+        elif not self.partial and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": str(self.path)})
+        else:
+            await self._send_chunks(send)
+
+    async def _send_chunks(self, send: Send) -> None:
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.offset)
+            remaining = self.count
+            while remaining:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                remaining = remaining - len(chunk) if chunk else 0
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": bool(remaining),
+                    },
+                )
+
+
+class MediaFiles(StaticFiles):
+    """
+    Serves the media directory with HTTP caching.
+
+    Generated files are named after a hash of their inputs and never
+    rewritten, so the hash is their strong ETag and clients may cache them
+    as immutable. Other files get an ETag from their inode, modification
+    time and size, and must be revalidated. Conditional requests are
+    answered with 304 and single byte ranges with 206.
+    """
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """
+        Answer a request for a file, with caching headers.
+
+        :param full_path: path of the file.
+        :param stat_result: status of the file.
+        :param scope: ASGI scope.
+        :param status_code: status code of a full response.
+        :return: 304 if the client's copy is current, otherwise the file.
+        """
+        request_headers = Headers(scope=scope)
+        file_name = Path(full_path).name
+        digest = media_digest(file_name)
+        if digest is not None:
+            etag = f'"{digest}"'
+            cache_control = _IMMUTABLE
+        else:
+            etag = (
+                f'"{stat_result.st_ino:x}-{stat_result.st_mtime_ns:x}'
+                f'-{stat_result.st_size:x}"'
+            )
+            cache_control = _REVALIDATE
+        headers = {
+            "etag": etag,
+            "cache-control": cache_control,
+            "accept-ranges": "bytes",
+        }
+        self._touch(scope, file_name, stat_result)
+
+        response = MediaFileResponse(
+            full_path,
+            stat_result,
+            headers,
+            status_code=status_code,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+
+        range_header = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if status_code != 200 or range_header is None:
+            return response
+        if if_range is not None and if_range != etag:
+            return response  # The client's copy is outdated, send it whole.
+        try:
+            byte_range = parse_range(range_header, stat_result.st_size)
+        except RangeNotSatisfiableError:
+            return Response(
+                status_code=416,
+                headers={"content-range": f"bytes */{stat_result.st_size}"},
+            )
+        if byte_range is None:
+            return response
+        return MediaFileResponse(full_path, stat_result, headers, byte_range)
+
+    def _touch(
+        self,
+        scope: Scope,
+        file_name: str,
+        stat_result: os.stat_result,
+    ) -> None:
+        last_used = max(stat_result.st_atime, stat_result.st_mtime)
+        if time.time() - last_used < _TOUCH_INTERVAL:
+            return
+        app = scope.get("app")
+        store = getattr(app.state, "media_store", None) if app is not None else None
+        if store is not None:
+            store.touch(file_name)
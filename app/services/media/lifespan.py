@@ -0,0 +1,29 @@
+from fastapi import FastAPI
+
+from app.core.settings import settings
+from app.services.media.store import MediaStore
+
+
+def init_media_store(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the media store and starts its sweeper.
+
+    :param app: current fastapi application.
+    """
+    store = MediaStore(
+        root=settings.media_dir_static,
+        ttl=settings.media_ttl,
+        max_bytes=settings.media_max_mb * 1024 * 1024,
+        sweep_interval=settings.media_sweep_interval,
+    )
+    store.start()
+    app.state.media_store = store
+
+
+async def shutdown_media_store(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Stops the media store's sweeper.
+
+    :param app: current fastapi application.
+    """
+    await app.state.media_store.shutdown()
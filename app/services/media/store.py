@@ -0,0 +1,180 @@
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from app.utils.media_utils import save_media
+
+logger = logging.getLogger(__name__)
+
+# Temporary files of interrupted writes are removed after this many seconds.
+_STALE_TEMP_AGE = 3600
+
+
+class MediaStore:
+    """
+    Generated files served from the media directory.
+
+    Files are removed by a background sweeper once nobody has downloaded
+    or reused them for ``ttl`` seconds, and the least recently used ones
+    go first whenever the directory grows over ``max_bytes``.
+
+    Last use is tracked with the access time, which the store sets itself,
+    so eviction works on filesystems mounted with noatime as well. Every
+    worker sweeps the same directory; a file removed by another worker is
+    simply skipped.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        ttl: int,
+        max_bytes: int,
+        sweep_interval: int,
+    ) -> None:
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._bytes = 0
+        self._files = 0
+        self._evicted = 0
+        self._expired = 0
+        self._wake_up = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, file_name: str) -> Path:
+        """
+        Get the path of a file in the store.
+
+        :param file_name: name of the file.
+        :return: path of the file.
+        """
+        return self.root / file_name
+
+    def touch(self, file_name: str) -> None:
+        """
+        Mark a file as used, keeping it longer.
+
+        :param file_name: name of the file.
+        """
+        path = self.path(file_name)
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path, (time.time(), path.stat().st_mtime))
+
+    async def save(self, file_name: str, data: bytes) -> Path:
+        """
+        Atomically write a file to the store.
+
+        :param file_name: name of the file.
+        :param data: content of the file.
+        :return: path of the file.
+        """
+        path = self.path(file_name)
+        await asyncio.to_thread(save_media, path, data)
+        self._added(len(data))
+        return path
+
+    async def persist(
+        self,
+        file_name: str,
+        render: Callable[[], Awaitable[bytes]],
+    ) -> Path:
+        """
+        Make sure a file exists in the store.
+
+        A file saved before under the same name is reused, otherwise it is
+        rendered and saved.
+
+        :param file_name: name of the file, see ``media_name``.
+        :param render: renders the file.
+        :return: path of the file.
+        """
+        path = self.path(file_name)
+        if path.exists():
+            await asyncio.to_thread(self.touch, file_name)
+            return path
+        return await self.save(file_name, await render())
+
+    def start(self) -> None:
+        """Start the background sweeper."""
+        self._task = asyncio.create_task(self._sweep_periodically())
+
+    async def shutdown(self) -> None:
+        """Stop the background sweeper."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def sweep(self) -> None:
+        """Remove expired files, then least recently used ones over the size limit."""
+        now = time.time()
+        files = []
+        for entry in os.scandir(self.root):
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if entry.name.startswith("."):
+                stale = now - stat.st_mtime > _STALE_TEMP_AGE
+                if entry.name.endswith(".tmp") and stale:
+                    self._remove(entry.path)
+                continue
+            last_used = max(stat.st_atime, stat.st_mtime)
+            if now - last_used > self.ttl:
+                if self._remove(entry.path):
+                    self._expired += 1
+                continue
+            files.append((last_used, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        remaining = len(files)
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                self._evicted += 1
+            total -= size
+            remaining -= 1
+        self._bytes = total
+        self._files = remaining
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get store counters.
+
+        :return: bytes and files stored, files removed for age and for space.
+        """
+        return {
+            "bytes_stored": self._bytes,
+            "files": self._files,
+            "files_expired": self._expired,
+            "files_evicted": self._evicted,
+        }
+
+    def _added(self, size: int) -> None:
+        self._bytes += size
+        self._files += 1
+        if self._bytes > self.max_bytes:
+            self._wake_up.set()
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception:
+                logger.exception("Failed to sweep the media directory.")
+            self._wake_up.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake_up.wait(), self.sweep_interval)
+
+    def _remove(self, path: str) -> bool:
+        try:
+            Path(path).unlink()
+        except FileNotFoundError:
+            return False
+        return True
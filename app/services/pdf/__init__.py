@@ -0,0 +1,17 @@
+"""PDF rendering backends and their worker pool."""
+
+from app.services.pdf.base import PdfRenderer, Section
+from app.services.pdf.dependency import get_pdf_renderer
+from app.services.pdf.fpdf_backend import FpdfRenderer
+from app.services.pdf.pool import PdfRenderPool, create_renderer
+from app.services.pdf.pymupdf_backend import PyMuPdfRenderer
+
+__all__ = [
+    "FpdfRenderer",
+    "PdfRenderPool",
+    "PdfRenderer",
+    "PyMuPdfRenderer",
+    "Section",
+    "create_renderer",
+    "get_pdf_renderer",
+]
@@ -0,0 +1,35 @@
+import abc
+
+# Title and text of a newsletter section.
+Section = tuple[str, str]
+
+
+class PdfRenderer(abc.ABC):
+    """
+    Renders the layouts of the generated documents to PDF.
+
+    Texts are plain, without markdown. Each backend owns the look of
+    the layouts, so documents keep their structure across backends.
+    """
+
+    #: Name of the backend, part of the names of saved documents.
+    name: str
+
+    @abc.abstractmethod
+    def newsletter(self, class_name: str, sections: list[Section]) -> bytes:
+        """
+        Renders a weekly class newsletter.
+
+        :param class_name: name of the class, shown in the page header.
+        :param sections: titled sections, in order.
+        :return: content of the PDF.
+        """
+
+    @abc.abstractmethod
+    def lesson_intro(self, text: str) -> bytes:
+        """
+        Renders a lesson introduction.
+
+        :param text: introduction, paragraphs separated by newlines.
+        :return: content of the PDF.
+        """
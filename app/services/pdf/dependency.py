@@ -0,0 +1,13 @@
+from starlette.requests import Request
+
+from app.services.pdf.pool import PdfRenderPool
+
+
+def get_pdf_renderer(request: Request) -> PdfRenderPool:
+    """
+    Get the PDF renderer.
+
+    :param request: current request.
+    :return: renderer stored in the application's state.
+    """
+    return request.app.state.pdf_renderer
@@ -0,0 +1,119 @@
+from fpdf import FPDF
+
+from app.services.pdf.base import PdfRenderer, Section
+
+# Characters that Gemini likes and the core fonts can't encode.
+_REPLACEMENTS = {
+    "\u2013": "-",  # En dash
+    "\u2014": "-",  # Em dash
+    "\u201c": '"',  # Left double quote
+    "\u201d": '"',  # Right double quote
+    "\u2018": "'",  # Left single quote
+    "\u2019": "'",  # Right single quote
+    "\u2022": "-",  # Bullet point
+}
+
+
+def to_latin1(text: str) -> str:
+    """
+    Makes text encodable with the core fonts.
+
+    Common typographic characters get an ASCII equivalent, anything else
+    outside Latin-1 becomes a question mark.
+
+    :param text: text to render.
+    :return: Latin-1 text.
+    """
+    for char, replacement in _REPLACEMENTS.items():
+        text = text.replace(char, replacement)
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+class OnePagerPDF(FPDF):
+    """Newsletter layout: a header with the class name, then titled sections."""
+
+    def __init__(self, header_text: str = "") -> None:
+        super().__init__()
+        self.header_text = header_text  # Store the class name for the header
+
+    def header(self) -> None:
+        """Draws the page header with the class name."""
+        self.set_font("Arial", "B", 16)
+        self.cell(
+            0,
+            10,
+            f"{self.header_text}: Weekly Class Newsletter",
+            ln=1,
+            align="C",
+        )
+        self.ln(10)
+
+    def add_section(self, title: str, content: str) -> None:
+        """
+        Draws a section with a colored title.
+
+        :param title: title of the section, Latin-1 only.
+        :param content: text of the section, Latin-1 only.
+        """
+        self.set_font("Arial", "B", 14)
+        self.set_text_color(0, 102, 204)
+        self.cell(0, 10, title, ln=1)
+        self.ln(5)
+        self.set_font("Arial", "", 12)
+        self.set_text_color(0, 0, 0)
+        self.multi_cell(0, 10, content)
+        self.ln(10)
+
+
+class LessonPDF(FPDF):
+    """A custom PDF class for creating lesson introduction PDFs."""
+
+    def header(self) -> None:
+        """Draws the page header."""
+        self.set_font("Arial", "B", 16)
+        self.cell(0, 10, "Lesson Introduction", ln=True, align="C")
+        self.ln(10)
+
+    def footer(self) -> None:
+        """Draws the page number."""
+        self.set_y(-15)
+        self.set_font("Arial", "I", 10)
+        self.cell(0, 10, f"Page {self.page_no()}", align="C")
+
+
+class FpdfRenderer(PdfRenderer):
+    """
+    Renderer built on fpdf and its core Arial font.
+
+    The core fonts only cover Latin-1, so other scripts are lost.
+    """
+
+    name = "fpdf"
+
+    def newsletter(self, class_name: str, sections: list[Section]) -> bytes:
+        """
+        Renders a weekly class newsletter.
+
+        :param class_name: name of the class, shown in the page header.
+        :param sections: titled sections, in order.
+        :return: content of the PDF.
+        """
+        pdf = OnePagerPDF(to_latin1(class_name))
+        pdf.add_page()
+        for title, content in sections:
+            pdf.add_section(to_latin1(title), to_latin1(content))
+        return pdf.output(dest="S").encode("latin-1")
+
+    def lesson_intro(self, text: str) -> bytes:
+        """
+        Renders a lesson introduction.
+
+        :param text: introduction, paragraphs separated by newlines.
+        :return: content of the PDF.
+        """
+        pdf = LessonPDF()
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+        pdf.multi_cell(0, 10, to_latin1(text))
+        return pdf.output(dest="S").encode("latin-1")
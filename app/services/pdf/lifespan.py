@@ -0,0 +1,28 @@
+from fastapi import FastAPI
+
+from app.core.settings import settings
+from app.services.pdf.pool import PdfRenderPool
+
+
+async def init_pdf_renderer(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts the PDF renderer and its worker processes.
+
+    :param app: current fastapi application.
+    """
+    renderer = PdfRenderPool(
+        backend=settings.pdf_backend,
+        workers=settings.pdf_render_workers,
+        font_path=settings.pdf_font_path or None,
+    )
+    await renderer.warm_up()
+    app.state.pdf_renderer = renderer
+
+
+def shutdown_pdf_renderer(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Stops the PDF renderer.
+
+    :param app: current fastapi application.
+    """
+    app.state.pdf_renderer.shutdown()
@@ -0,0 +1,136 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+from app.core.settings import PdfBackend
+from app.services.pdf.base import PdfRenderer, Section
+from app.services.pdf.fpdf_backend import FpdfRenderer
+from app.services.pdf.pymupdf_backend import PyMuPdfRenderer
+
+# Renderer of the current worker process.
+_renderer: Optional[PdfRenderer] = None
+
+
+def create_renderer(
+    backend: PdfBackend,
+    font_path: Optional[str] = None,
+) -> PdfRenderer:
+    """
+    Creates a renderer.
+
+    :param backend: library to render with.
+    :param font_path: font for the PyMuPDF backend.
+    :return: renderer.
+    """
+    if backend == PdfBackend.FPDF:
+        return FpdfRenderer()
+    return PyMuPdfRenderer(font_path)
+
+
+def _init_worker(
+    backend: PdfBackend,
+    font_path: Optional[str],
+) -> None:  # pragma: no cover
+    """
+    Creates the renderer of a worker process, loading its fonts once.
+
+    :param backend: library to render with.
+    :param font_path: font for the PyMuPDF backend.
+    """
+    global _renderer  # noqa: PLW0603
+    _renderer = create_renderer(backend, font_path)
+
+
+def _warm_up() -> None:  # pragma: no cover
+    """No-op job, used to start worker processes eagerly."""
+
+
+def _render(layout: str, *args: Any) -> bytes:  # pragma: no cover
+    """
+    Renders a layout inside a worker process.
+
+    :param layout: name of the renderer method.
+    :param args: arguments of the method.
+    :return: content of the PDF.
+    """
+    return getattr(_renderer, layout)(*args)
+
+
+class PdfRenderPool:
+    """
+    Renders PDFs off the event loop.
+
+    Layout is CPU bound and MuPDF isn't thread-safe, so with ``workers``
+    set documents are rendered in that many processes, each with its own
+    renderer. Without workers they are rendered one at a time in the
+    thread pool.
+    """
+
+    def __init__(
+        self,
+        backend: PdfBackend,
+        workers: int = 0,
+        font_path: Optional[str] = None,
+    ) -> None:
+        self.backend = backend
+        self.workers = workers
+        self._renderer: Optional[PdfRenderer] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        if workers:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(backend, font_path),
+            )
+        else:
+            self._renderer = create_renderer(backend, font_path)
+
+    async def warm_up(self) -> None:
+        """Starts the worker processes, so they load their fonts before any request."""
+        if self._executor is None:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _warm_up)
+                for _ in range(self.workers)
+            ),
+        )
+
+    async def newsletter(self, class_name: str, sections: list[Section]) -> bytes:
+        """
+        Renders a weekly class newsletter.
+
+        :param class_name: name of the class, shown in the page header.
+        :param sections: titled sections, in order.
+        :return: content of the PDF.
+        """
+        return await self._run("newsletter", class_name, sections)
+
+    async def lesson_intro(self, text: str) -> bytes:
+        """
+        Renders a lesson introduction.
+
+        :param text: introduction, paragraphs separated by newlines.
+        :return: content of the PDF.
+        """
+        return await self._run("lesson_intro", text)
+
+    async def _run(self, layout: str, *args: Any) -> bytes:
+        if self._executor is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, _render, layout, *args)
+        return await asyncio.to_thread(self._render_locally, layout, *args)
+
+    def _render_locally(self, layout: str, *args: Any) -> bytes:
+        with self._lock:
+            return getattr(self._renderer, layout)(*args)
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,140 @@
+import html
+import io
+from pathlib import Path
+from typing import Any, Optional
+
+import fitz
+
+from app.services.pdf.base import PdfRenderer, Section
+
+# A4, with the margins fpdf uses.
+_PAGE = fitz.paper_rect("a4")
+_MARGIN = 28.35
+_HEADER = fitz.Rect(_MARGIN, _MARGIN, _PAGE.width - _MARGIN, _MARGIN + 40)
+_BODY = fitz.Rect(_MARGIN, _HEADER.y1 + 14, _PAGE.width - _MARGIN, _PAGE.height - 50)
+_FOOTER = fitz.Rect(
+    _MARGIN,
+    _PAGE.height - 42,
+    _PAGE.width - _MARGIN,
+    _PAGE.height - 14,
+)
+
+_BASE_CSS = """
+body { font-family: %(font)s; font-size: 12pt; line-height: 1.5; }
+p { margin: 0 0 6pt 0; }
+.header { font-size: 16pt; font-weight: bold; text-align: center; }
+.footer { font-size: 10pt; font-style: italic; text-align: center; }
+"""
+
+_NEWSLETTER_CSS = """
+h2 { font-size: 14pt; font-weight: bold; color: #0066cc; margin: 0 0 8pt 0; }
+section { margin-bottom: 18pt; }
+"""
+
+
+class PyMuPdfRenderer(PdfRenderer):
+    """
+    Renderer built on MuPDF's HTML layout engine.
+
+    Text in any script is rendered: glyphs missing from the body font are
+    taken from MuPDF's built-in Noto fonts. The fonts and the layout styles
+    are loaded once, when the renderer is created, and every document only
+    embeds the glyphs it uses.
+    """
+
+    name = "pymupdf"
+
+    def __init__(self, font_path: Optional[str] = None) -> None:
+        """
+        Loads the fonts and the layout styles.
+
+        :param font_path: TrueType or OpenType font for the text,
+            MuPDF's sans-serif font by default.
+        """
+        font = "sans-serif"
+        font_face = ""
+        self._archive = None
+        if font_path:
+            self._archive = fitz.Archive(str(Path(font_path).resolve().parent))
+            font = "document"
+            font_face = (
+                "@font-face { font-family: document; src: url(%s); }"
+                % Path(font_path).name
+            )
+        base_css = font_face + _BASE_CSS % {"font": font}
+        self._lesson_css = base_css
+        self._newsletter_css = base_css + _NEWSLETTER_CSS
+
+    def newsletter(self, class_name: str, sections: list[Section]) -> bytes:
+        """
+        Renders a weekly class newsletter.
+
+        :param class_name: name of the class, shown in the page header.
+        :param sections: titled sections, in order.
+        :return: content of the PDF.
+        """
+        body = "".join(
+            f"<section><h2>{html.escape(title)}</h2>{_paragraphs(content)}</section>"
+            for title, content in sections
+        )
+        header = f"{html.escape(class_name)}: Weekly Class Newsletter"
+        return self._render(body, self._newsletter_css, header, page_numbers=False)
+
+    def lesson_intro(self, text: str) -> bytes:
+        """
+        Renders a lesson introduction.
+
+        :param text: introduction, paragraphs separated by newlines.
+        :return: content of the PDF.
+        """
+        return self._render(
+            _paragraphs(text),
+            self._lesson_css,
+            "Lesson Introduction",
+            page_numbers=True,
+        )
+
+    def _render(
+        self,
+        body: str,
+        css: str,
+        header: str,
+        page_numbers: bool,
+    ) -> bytes:
+        buffer = io.BytesIO()
+        writer = fitz.DocumentWriter(buffer, "compress")
+        story = fitz.Story(body, user_css=css, archive=self._archive)
+        page = 0
+        more = True
+        while more:
+            page += 1
+            device = writer.begin_page(_PAGE)
+            self._draw(f'<p class="header">{header}</p>', css, _HEADER, device)
+            if page_numbers:
+                self._draw(f'<p class="footer">Page {page}</p>', css, _FOOTER, device)
+            more, _ = story.place(_BODY)
+            story.draw(device)
+            writer.end_page()
+        writer.close()
+
+        # Fonts are embedded whole, keep only the glyphs the document uses.
+        document = fitz.open("pdf", buffer.getvalue())
+        document.subset_fonts()
+        return document.tobytes(garbage=3, deflate=True)
+
+    def _draw(
+        self,
+        content: str,
+        css: str,
+        where: fitz.Rect,
+        device: Any,
+    ) -> None:
+        story = fitz.Story(content, user_css=css, archive=self._archive)
+        story.place(where)
+        story.draw(device)
+
+
+def _paragraphs(text: str) -> str:
+    return "".join(
+        f"<p>{html.escape(line)}</p>" for line in text.splitlines() if line.strip()
+    )
@@ -0,0 +1,15 @@
+"""Speech-to-text worker pool."""
+
+from app.services.transcription.dependency import get_transcription_pool
+from app.services.transcription.pool import (
+    Transcription,
+    TranscriptionBusyError,
+    TranscriptionPool,
+)
+
+__all__ = [
+    "Transcription",
+    "TranscriptionBusyError",
+    "TranscriptionPool",
+    "get_transcription_pool",
+]
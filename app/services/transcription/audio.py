@@ -0,0 +1,69 @@
+import math
+import subprocess
+from typing import Optional
+
+import numpy as np
+from whisper.audio import SAMPLE_RATE
+
+# Bytes of a decoded sample, signed 16-bit.
+_SAMPLE_BYTES = 2
+
+
+def pcm_size(seconds: float) -> int:
+    """
+    Get the size of decoded audio, before decoding it.
+
+    :param seconds: duration of the audio.
+    :return: size in bytes of the raw PCM written by ``decode_to_pcm``.
+    """
+    return math.ceil(seconds * SAMPLE_RATE) * _SAMPLE_BYTES
+
+
+def decode_to_pcm(source: str, target: str, max_bytes: Optional[int] = None) -> None:
+    """
+    Decode an audio file to raw 16 kHz mono PCM, the format Whisper uses.
+
+    Samples are stored as signed 16-bit little-endian integers, so
+    transcription jobs can memory-map them instead of decoding again.
+
+    :param source: audio file in any format ffmpeg reads.
+    :param target: path of the raw PCM file to write.
+    :param max_bytes: optional limit of the PCM file, ffmpeg stops writing
+        once it is reached.
+    """
+    limit = ["-fs", str(max_bytes)] if max_bytes is not None else []
+    subprocess.run(  # noqa: S603
+        [  # noqa: S607
+            "ffmpeg",
+            "-nostdin",
+            "-loglevel",
+            "error",
+            "-y",
+            "-i",
+            source,
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            str(SAMPLE_RATE),
+            *limit,
+            "-f",
+            "s16le",
+            target,
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+
+def load_pcm(path: str, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+    """
+    Read samples from a raw PCM file, as Whisper expects them.
+
+    :param path: path to a file written by ``decode_to_pcm``.
+    :param start: first sample to read.
+    :param end: sample after the last one to read, defaults to the end.
+    :return: float32 samples between -1 and 1.
+    """
+    samples = np.memmap(path, dtype=np.int16, mode="r")
+    return samples[start:end].astype(np.float32) / 32768.0
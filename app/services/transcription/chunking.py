@@ -0,0 +1,97 @@
+import re
+
+import numpy as np
+from whisper.audio import SAMPLE_RATE
+
+# Length of the frames used to measure loudness, in seconds.
+_FRAME_SECONDS = 0.03
+_WORD_NORMALIZER = re.compile(r"[^\w']+")
+
+
+def plan_chunks(
+    audio: np.ndarray,
+    chunk_seconds: float,
+    overlap_seconds: float,
+    search_seconds: float = 10.0,
+) -> list[tuple[int, int]]:
+    """
+    Split audio into overlapping segments that end on quiet moments.
+
+    Every boundary is placed on the quietest frame within ``search_seconds``
+    of the ideal position, so words are rarely cut in half. Segments are
+    then widened by ``overlap_seconds`` on both sides, so a word cut anyway
+    appears whole in at least one of them.
+
+    :param audio: mono audio sampled at 16 kHz.
+    :param chunk_seconds: target length of a segment.
+    :param overlap_seconds: overlap added on each side of a boundary.
+    :param search_seconds: how far from the target to look for silence.
+    :return: list of (start, end) sample offsets.
+    """
+    total = len(audio)
+    chunk = int(chunk_seconds * SAMPLE_RATE)
+    if total <= chunk:
+        return [(0, total)]
+
+    frame = int(_FRAME_SECONDS * SAMPLE_RATE)
+    frames = total // frame
+    energy = np.sqrt(
+        np.mean(
+            np.square(audio[: frames * frame].reshape(frames, frame), dtype=np.float32),
+            axis=1,
+        ),
+    )
+    search = int(search_seconds * SAMPLE_RATE) // frame
+
+    cuts = [0]
+    while total - cuts[-1] > chunk:
+        target = (cuts[-1] + chunk) // frame
+        low = max(target - search, cuts[-1] // frame + 1)
+        high = min(target + search, frames - 1)
+        if low >= high:
+            cuts.append(target * frame)
+            continue
+        quietest = low + int(np.argmin(energy[low:high]))
+        cuts.append(quietest * frame)
+    cuts.append(total)
+
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    return [
+        (max(start - overlap, 0), min(end + overlap, total))
+        for start, end in zip(cuts, cuts[1:])
+    ]
+
+
+def merge_transcripts(texts: list[str], max_overlap_words: int = 40) -> str:
+    """
+    Join segment transcripts, dropping words repeated at the overlaps.
+
+    For every pair of neighbouring segments the longest run of words that
+    ends the first one and starts the second one is kept only once.
+    Words are compared case-insensitively and without punctuation.
+
+    :param texts: transcripts of consecutive segments.
+    :param max_overlap_words: longest overlap to look for.
+    :return: stitched transcript.
+    """
+    merged: list[str] = []
+    for text in texts:
+        words = text.split()
+        if not words:
+            continue
+        overlap = _overlap_length(merged, words, max_overlap_words)
+        merged.extend(words[overlap:])
+    return " ".join(merged)
+
+
+def _normalize(word: str) -> str:
+    return _WORD_NORMALIZER.sub("", word.lower())
+
+
+def _overlap_length(head: list[str], tail: list[str], limit: int) -> int:
+    head_words = [_normalize(word) for word in head[-limit:]]
+    tail_words = [_normalize(word) for word in tail[:limit]]
+    for size in range(min(len(head_words), len(tail_words)), 0, -1):
+        if head_words[-size:] == tail_words[:size]:
+            return size
+    return 0
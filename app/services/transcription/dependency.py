@@ -0,0 +1,13 @@
+from starlette.requests import Request
+
+from app.services.transcription.pool import TranscriptionPool
+
+
+def get_transcription_pool(request: Request) -> TranscriptionPool:
+    """
+    Get the transcription worker pool.
+
+    :param request: current request.
+    :return: pool stored in the application's state.
+    """
+    return request.app.state.transcription_pool
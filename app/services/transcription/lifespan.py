@@ -0,0 +1,37 @@
+from fastapi import FastAPI
+
+from app.core.settings import settings
+from app.services.transcription.pool import TranscriptionPool
+
+
+async def init_transcription(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts the transcription worker pool.
+
+    With whisper_preload enabled, worker processes are started and load
+    the Whisper model before the application accepts requests.
+
+    :param app: current fastapi application.
+    """
+    pool = TranscriptionPool(
+        workers=settings.transcription_workers,
+        queue_size=settings.transcription_queue_size,
+        timeout=settings.transcription_timeout,
+        model_size=settings.whisper_model,
+        preload=settings.whisper_preload,
+        threads_per_worker=settings.transcription_threads_per_worker,
+        chunk_seconds=settings.transcription_chunk_seconds,
+        chunk_overlap=settings.transcription_chunk_overlap,
+    )
+    if settings.whisper_preload:
+        await pool.warm_up()
+    app.state.transcription_pool = pool
+
+
+def shutdown_transcription(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Stops the transcription worker pool.
+
+    :param app: current fastapi application.
+    """
+    app.state.transcription_pool.shutdown()
@@ -0,0 +1,269 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, NamedTuple, Optional, TypeVar
+
+import numpy as np
+import whisper
+
+from app.services.transcription.audio import load_pcm
+from app.services.transcription.chunking import merge_transcripts, plan_chunks
+from app.services.whisper.registry import whisper_models
+
+T = TypeVar("T")
+
+# Called with the number of finished segments and the total.
+ProgressCallback = Callable[[int, int], None]
+
+
+class TranscriptionBusyError(Exception):
+    """Raised when the transcription queue is full."""
+
+
+class Transcription(NamedTuple):
+    """Result of a transcription job."""
+
+    text: str
+    language: str
+
+
+def _init_worker(
+    model_size: str,
+    preload: bool,
+    threads: int,
+) -> None:  # pragma: no cover
+    """
+    Prepares a worker process.
+
+    :param model_size: Whisper model size used by the pool.
+    :param preload: whether to load the model before the first job.
+    :param threads: torch threads for this worker, so workers don't compete.
+    """
+    import torch
+
+    torch.set_num_threads(threads)
+    if preload:
+        whisper_models.get(model_size)
+
+
+def _warm_up() -> None:  # pragma: no cover
+    """No-op job, used to start worker processes eagerly."""
+
+
+def _transcribe(pcm_path: str, model_size: str) -> Transcription:  # pragma: no cover
+    """
+    Transcribes decoded audio inside a worker process.
+
+    :param pcm_path: path to the raw PCM samples.
+    :param model_size: Whisper model size.
+    :return: transcribed text and detected language.
+    """
+    model = whisper_models.get(model_size)
+    result = model.transcribe(load_pcm(pcm_path))
+    return Transcription(text=result["text"], language=result["language"])
+
+
+def _prepare_chunks(
+    pcm_path: str,
+    model_size: str,
+    chunk_seconds: float,
+    overlap_seconds: float,
+) -> tuple[list[tuple[int, int]], str]:  # pragma: no cover
+    """
+    Plans the segments of decoded audio inside a worker process.
+
+    :param pcm_path: path to the raw PCM samples.
+    :param model_size: Whisper model size, used for language detection.
+    :param chunk_seconds: target segment length.
+    :param overlap_seconds: overlap between neighbouring segments.
+    :return: segment offsets and language.
+    """
+    audio = load_pcm(pcm_path)
+    segments = plan_chunks(audio, chunk_seconds, overlap_seconds)
+    return segments, _detect_language(whisper_models.get(model_size), audio)
+
+
+def _detect_language(
+    model: whisper.Whisper,
+    audio: np.ndarray,
+) -> str:  # pragma: no cover
+    """
+    Detects the spoken language from the first 30 seconds of audio.
+
+    All segments are then transcribed in this language, instead of each
+    segment guessing it on its own.
+
+    :param model: loaded Whisper model.
+    :param audio: decoded audio.
+    :return: language code.
+    """
+    if not model.is_multilingual:
+        return "en"
+    mel = whisper.log_mel_spectrogram(
+        whisper.pad_or_trim(audio),
+        model.dims.n_mels,
+    ).to(model.device)
+    _, probs = model.detect_language(mel)
+    return max(probs, key=probs.get)
+
+
+def _transcribe_segment(
+    pcm_path: str,
+    start: int,
+    end: int,
+    model_size: str,
+    language: str,
+) -> str:  # pragma: no cover
+    """
+    Transcribes one segment of decoded audio inside a worker process.
+
+    :param pcm_path: path to the raw PCM samples.
+    :param start: first sample of the segment.
+    :param end: sample after the last one of the segment.
+    :param model_size: Whisper model size.
+    :param language: language of the audio.
+    :return: transcribed text.
+    """
+    model = whisper_models.get(model_size)
+    return model.transcribe(load_pcm(pcm_path, start, end), language=language)["text"]
+
+
+class TranscriptionPool:
+    """
+    Bounded process pool for Whisper transcription.
+
+    Whisper is CPU bound and runs for minutes on long videos, so it runs
+    in separate processes and the event loop only awaits the result.
+    At most ``workers`` jobs run at once and at most ``queue_size`` more
+    wait for a free worker; anything beyond that is rejected.
+
+    With ``chunk_seconds`` set, long audio is split into overlapping
+    segments on quiet moments, the segments are transcribed in parallel
+    across the workers and the texts are stitched back together.
+
+    A job that exceeds the timeout is reported as failed, but its worker
+    process finishes it before taking the next job.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        timeout: float,
+        model_size: str,
+        preload: bool = False,
+        threads_per_worker: int = 0,
+        chunk_seconds: float = 0,
+        chunk_overlap: float = 2.0,
+    ) -> None:
+        self.workers = workers
+        self.timeout = timeout
+        self.model_size = model_size
+        self.chunk_seconds = chunk_seconds
+        self.chunk_overlap = chunk_overlap
+        threads = threads_per_worker or max((os.cpu_count() or 1) // workers, 1)
+        self._capacity = workers + queue_size
+        self._active = 0
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            # Forking a process that runs an event loop and threads isn't safe.
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_size, preload, threads),
+        )
+
+    async def warm_up(self) -> None:
+        """Starts the worker processes, loading the model if preload is on."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _warm_up)
+                for _ in range(self.workers)
+            ),
+        )
+
+    async def transcribe(
+        self,
+        pcm_path: str,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Transcription:
+        """
+        Transcribes decoded audio in the pool.
+
+        :param pcm_path: path to raw PCM samples written by ``decode_to_pcm``.
+        :param progress: called whenever a segment is transcribed.
+        :raises TranscriptionBusyError: if the queue is full.
+        :return: transcribed text and its language.
+        """
+        if self._active >= self._capacity:
+            raise TranscriptionBusyError("Too many videos are being transcribed.")
+        self._active += 1
+        try:
+            if self.chunk_seconds:
+                job = self._transcribe_chunked(pcm_path, progress)
+            else:
+                job = self._transcribe_whole(pcm_path, progress)
+            return await asyncio.wait_for(job, timeout=self.timeout)
+        finally:
+            self._active -= 1
+
+    async def _transcribe_whole(
+        self,
+        pcm_path: str,
+        progress: Optional[ProgressCallback],
+    ) -> Transcription:
+        transcription = await self._run(_transcribe, pcm_path, self.model_size)
+        if progress is not None:
+            progress(1, 1)
+        return transcription
+
+    async def _transcribe_chunked(
+        self,
+        pcm_path: str,
+        progress: Optional[ProgressCallback],
+    ) -> Transcription:
+        segments, language = await self._run(
+            _prepare_chunks,
+            pcm_path,
+            self.model_size,
+            self.chunk_seconds,
+            self.chunk_overlap,
+        )
+        finished = 0
+
+        async def transcribe_segment(start: int, end: int) -> str:
+            nonlocal finished
+            text = await self._run(
+                _transcribe_segment,
+                pcm_path,
+                start,
+                end,
+                self.model_size,
+                language,
+            )
+            finished += 1
+            if progress is not None:
+                progress(finished, len(segments))
+            return text
+
+        texts = await asyncio.gather(
+            *(transcribe_segment(start, end) for start, end in segments),
+        )
+        return Transcription(text=merge_transcripts(texts), language=language)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get pool counters.
+
+        :return: number of workers and of running or queued jobs.
+        """
+        return {"workers": self.workers, "active_jobs": self._active}
+
+    def shutdown(self) -> None:
+        """Stops the worker processes, dropping queued jobs."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
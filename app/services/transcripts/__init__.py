@@ -0,0 +1,15 @@
+"""Persistent store of YouTube transcripts."""
+
+from app.services.transcripts.dependency import get_transcript_store
+from app.services.transcripts.store import (
+    StoredTranscript,
+    TranscriptSource,
+    TranscriptStore,
+)
+
+__all__ = [
+    "StoredTranscript",
+    "TranscriptSource",
+    "TranscriptStore",
+    "get_transcript_store",
+]
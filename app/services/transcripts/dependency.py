@@ -0,0 +1,13 @@
+from starlette.requests import Request
+
+from app.services.transcripts.store import TranscriptStore
+
+
+def get_transcript_store(request: Request) -> TranscriptStore:
+    """
+    Get the transcript store.
+
+    :param request: current request.
+    :return: transcript store from the application's state.
+    """
+    return request.app.state.transcript_store
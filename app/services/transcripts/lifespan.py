@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from fastapi import FastAPI
+
+from app.core.settings import settings
+from app.services.transcripts.store import TranscriptStore
+
+
+async def init_transcript_store(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Opens the transcript store and drops expired entries.
+
+    :param app: current fastapi application.
+    """
+    store = TranscriptStore(
+        path=Path(settings.cache_dir) / "transcripts.sqlite3",
+        max_age=settings.transcript_store_max_age,
+        max_bytes=settings.transcript_store_max_mb * 1024 * 1024,
+    )
+    await store.prune()
+    app.state.transcript_store = store
+
+
+def shutdown_transcript_store(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Closes the transcript store.
+
+    :param app: current fastapi application.
+    """
+    app.state.transcript_store.close()
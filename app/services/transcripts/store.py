@@ -0,0 +1,156 @@
+import asyncio
+import enum
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from app.utils.sqlite_utils import connect_sqlite
+
+
+class TranscriptSource(str, enum.Enum):
+    """Possible origins of a transcript."""
+
+    MANUAL = "manual"
+    GENERATED = "generated"
+    WHISPER = "whisper"
+
+
+class StoredTranscript(NamedTuple):
+    """Transcript of a video together with its origin."""
+
+    text: str
+    source: TranscriptSource
+    language: Optional[str]
+
+
+class TranscriptStore:
+    """
+    Transcripts keyed by YouTube video ID.
+
+    Texts are zlib-compressed in a SQLite file shared by all workers, so
+    a video that was already transcribed skips both YouTube and Whisper.
+    Entries older than ``max_age`` seconds are dropped, and the oldest
+    ones are dropped when the compressed texts exceed ``max_bytes``.
+    """
+
+    def __init__(self, path: Path, max_age: int, max_bytes: int) -> None:
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+        self._db = connect_sqlite(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            "video_id TEXT PRIMARY KEY, "
+            "source TEXT NOT NULL, "
+            "language TEXT, "
+            "text BLOB NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL)",
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS transcripts_created_at "
+            "ON transcripts (created_at)",
+        )
+
+    async def get(self, video_id: str) -> Optional[StoredTranscript]:
+        """
+        Get a stored transcript.
+
+        :param video_id: YouTube video ID.
+        :return: transcript or None.
+        """
+        transcript = await asyncio.to_thread(self._get, video_id)
+        self._counters["hits" if transcript is not None else "misses"] += 1
+        return transcript
+
+    async def put(self, video_id: str, transcript: StoredTranscript) -> None:
+        """
+        Store a transcript, evicting old entries if needed.
+
+        :param video_id: YouTube video ID.
+        :param transcript: transcript to store.
+        """
+        await asyncio.to_thread(self._put, video_id, transcript)
+
+    async def prune(self) -> None:
+        """Drop expired entries, then the oldest ones over the size limit."""
+        await asyncio.to_thread(self._locked_prune)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get store counters.
+
+        :return: hit, miss and eviction counters.
+        """
+        return dict(self._counters)
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    def _get(self, video_id: str) -> Optional[StoredTranscript]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text, source, language FROM transcripts "
+                "WHERE video_id = ? AND created_at > ?",
+                (video_id, time.time() - self.max_age),
+            ).fetchone()
+        if row is None:
+            return None
+        text, source, language = row
+        return StoredTranscript(
+            text=zlib.decompress(text).decode("utf-8"),
+            source=TranscriptSource(source),
+            language=language,
+        )
+
+    def _put(self, video_id: str, transcript: StoredTranscript) -> None:
+        compressed = zlib.compress(transcript.text.encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO transcripts "
+                "(video_id, source, language, text, size, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    video_id,
+                    transcript.source.value,
+                    transcript.language,
+                    compressed,
+                    len(compressed),
+                    time.time(),
+                ),
+            )
+            self._prune()
+
+    def _locked_prune(self) -> None:
+        with self._lock:
+            self._prune()
+
+    def _prune(self) -> None:
+        evicted = self._db.execute(
+            "DELETE FROM transcripts WHERE created_at <= ?",
+            (time.time() - self.max_age,),
+        ).rowcount
+        (total,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM transcripts",
+        ).fetchone()
+        if total > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT video_id, size FROM transcripts ORDER BY created_at",
+            ).fetchall()
+            stale = []
+            for video_id, size in rows:
+                if total <= self.max_bytes:
+                    break
+                stale.append((video_id,))
+                total -= size
+            self._db.executemany(
+                "DELETE FROM transcripts WHERE video_id = ?",
+                stale,
+            )
+            evicted += len(stale)
+        self._counters["evictions"] += evicted
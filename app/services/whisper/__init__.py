@@ -0,0 +1,5 @@
+"""Whisper speech-to-text service."""
+
+from app.services.whisper.registry import WhisperModelRegistry, whisper_models
+
+__all__ = ["WhisperModelRegistry", "whisper_models"]
@@ -0,0 +1,45 @@
+import threading
+
+import whisper
+
+
+class WhisperModelRegistry:
+    """
+    Process-wide registry of loaded Whisper models.
+
+    Each model size is loaded from disk once per process and then shared
+    by every request, instead of reloading the weights for every video.
+    """
+
+    def __init__(self) -> None:
+        self._models: dict[str, whisper.Whisper] = {}
+        self._lock = threading.Lock()
+
+    def get(self, size: str) -> whisper.Whisper:
+        """
+        Get a loaded model, loading it on first use.
+
+        :param size: model size, e.g. "base" or "small".
+        :return: loaded Whisper model.
+        """
+        model = self._models.get(size)
+        if model is not None:
+            return model
+        with self._lock:
+            # Another thread may have loaded it while we waited for the lock.
+            model = self._models.get(size)
+            if model is None:
+                model = whisper.load_model(size)
+                self._models[size] = model
+        return model
+
+    def loaded(self) -> list[str]:
+        """
+        Get sizes of the models loaded in this process.
+
+        :return: list of model sizes.
+        """
+        return list(self._models)
+
+
+whisper_models = WhisperModelRegistry()
@@ -0,0 +1,6 @@
+"""Per-job scratch directories."""
+
+from app.services.workspaces.dependency import get_workspaces
+from app.services.workspaces.manager import WorkspaceManager, WorkspaceQuotaError
+
+__all__ = ["WorkspaceManager", "WorkspaceQuotaError", "get_workspaces"]
@@ -0,0 +1,13 @@
+from starlette.requests import Request
+
+from app.services.workspaces.manager import WorkspaceManager
+
+
+def get_workspaces(request: Request) -> WorkspaceManager:
+    """
+    Get the workspace manager.
+
+    :param request: current request.
+    :return: workspace manager from the application's state.
+    """
+    return request.app.state.workspaces
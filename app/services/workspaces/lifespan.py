@@ -0,0 +1,27 @@
+import logging
+from pathlib import Path
+
+from fastapi import FastAPI
+
+from app.core.settings import settings
+from app.services.workspaces.manager import WorkspaceManager
+
+logger = logging.getLogger(__name__)
+
+
+def init_workspaces(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the workspace manager and removes leftovers of crashed jobs.
+
+    :param app: current fastapi application.
+    """
+    workspaces = WorkspaceManager(
+        root=Path(settings.workspace_dir),
+        quota_bytes=settings.workspace_quota_mb * 1024 * 1024,
+        orphan_age=settings.workspace_orphan_age,
+        job_bytes=settings.workspace_job_mb * 1024 * 1024,
+    )
+    removed = workspaces.remove_orphans()
+    if removed:
+        logger.warning("Removed %d orphaned workspaces.", removed)
+    app.state.workspaces = workspaces
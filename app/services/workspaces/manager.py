@@ -0,0 +1,187 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+
+class WorkspaceQuotaError(Exception):
+    """Raised when the workspaces use up their disk quota."""
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _tree_size(path: Path) -> int:
+    total = 0
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            total += _tree_size(Path(entry.path))
+        else:
+            total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
+class WorkspaceManager:
+    """
+    Scratch directories for jobs that work with files.
+
+    Every job gets a unique directory under ``root``, which is removed
+    when the job ends, whichever way it ends. Directory names carry the
+    worker's PID, so directories left behind by a crashed worker can be
+    told apart from the ones other workers are still using.
+
+    Every job also reserves its share of the quota, ``job_bytes`` or what
+    is left if that's less, and must keep its files within it. Jobs of
+    this worker count against the quota by their reservations, and the
+    directories of other workers by their size on disk, so concurrent jobs
+    can't go over the quota together.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        quota_bytes: int,
+        orphan_age: int,
+        job_bytes: int,
+    ) -> None:
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.orphan_age = orphan_age
+        self.job_bytes = job_bytes
+        # Bytes reserved by the active jobs of this worker, by directory.
+        self._reserved: dict[Path, int] = {}
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @asynccontextmanager
+    async def job(self, prefix: str = "job") -> AsyncIterator[Path]:
+        """
+        Create a directory for a single job and reserve its share of the quota.
+
+        :param prefix: prefix of the directory name.
+        :raises WorkspaceQuotaError: if the disk quota is used up.
+        :yield: path to the job's directory, see :meth:`budget` for its size.
+        """
+        unreserved = await asyncio.to_thread(self._unreserved_usage)
+        available = self.quota_bytes - unreserved - sum(self._reserved.values())
+        if available <= 0:
+            raise WorkspaceQuotaError("Not enough disk space for a new job.")
+        available = min(available, self.job_bytes)
+        path = Path(
+            tempfile.mkdtemp(prefix=f"{prefix}-{os.getpid()}-", dir=self.root),
+        )
+        self._reserved[path] = available
+        try:
+            yield path
+        finally:
+            try:
+                await asyncio.to_thread(shutil.rmtree, path, ignore_errors=True)
+            finally:
+                # Released once the files are gone, so they're never uncounted.
+                del self._reserved[path]
+
+    def budget(self, path: Path) -> int:
+        """
+        Get the disk space reserved for an active job.
+
+        :param path: path to the job's directory.
+        :return: size in bytes.
+        """
+        return self._reserved[path]
+
+    def usage(self) -> int:
+        """
+        Get disk usage of all workspaces, in all workers.
+
+        :return: size in bytes.
+        """
+        return _tree_size(self.root)
+
+    def remaining(self) -> int:
+        """
+        Get disk space left under the quota, neither used nor reserved.
+
+        :return: size in bytes.
+        """
+        used = self._unreserved_usage() + sum(self._reserved.values())
+        return max(self.quota_bytes - used, 0)
+
+    def orphans(self) -> list[Path]:
+        """
+        Find directories no running job owns.
+
+        A directory is an orphan if its worker is gone, if it belongs to
+        this worker but no job of it is active, or if it is older than
+        ``orphan_age`` seconds.
+
+        :return: list of orphaned paths.
+        """
+        found = []
+        deadline = time.time() - self.orphan_age
+        for entry in os.scandir(self.root):
+            path = Path(entry.path)
+            if path in self._reserved:
+                continue
+            try:
+                pid = int(entry.name.split("-")[1])
+            except (IndexError, ValueError):
+                pid = None
+            if (
+                pid is None
+                or pid == os.getpid()
+                or not _pid_alive(pid)
+                or entry.stat(follow_symlinks=False).st_mtime < deadline
+            ):
+                found.append(path)
+        return found
+
+    def remove_orphans(self) -> int:
+        """
+        Remove orphaned directories and files.
+
+        :return: number of removed entries.
+        """
+        orphans = self.orphans()
+        for path in orphans:
+            if path.is_dir() and not path.is_symlink():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+        return len(orphans)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get workspace counters.
+
+        :return: active jobs, disk usage, reservations, quota and orphans.
+        """
+        return {
+            "active_jobs": len(self._reserved),
+            "bytes_used": self.usage(),
+            "bytes_reserved": sum(self._reserved.values()),
+            "quota_bytes": self.quota_bytes,
+            "orphans": len(self.orphans()),
+        }
+
+    def _unreserved_usage(self) -> int:
+        # Directories of this worker's jobs count by their reservations.
+        total = 0
+        for entry in os.scandir(self.root):
+            path = Path(entry.path)
+            if path in self._reserved:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                total += _tree_size(path)
+            else:
+                total += entry.stat(follow_symlinks=False).st_size
+        return total
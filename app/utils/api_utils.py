@@ -1,10 +1,24 @@
-from typing import Optional
+import json
+from typing import Any, Optional
 
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
 from app.core.settings import settings
 
 
+def media_url(file_path: str) -> str:
+    """The function builds the public URL of a file in the media directory.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        str: URL the file is served from.
+    """
+    file_name = file_path.split("/")[-1]
+    return f"{settings.media_base_url}/{file_name}"
+
+
 def make_response(
     content: Optional[str] = None,
     file_path: Optional[str] = None,
@@ -29,10 +43,48 @@ def make_response(
         )
     if file_path is not None:
         file_name = file_path.split("/")[-1]
-        media_url = f"{settings.media_base_url}/{file_name}"
         return StreamingResponse(
-            content=media_url,
+            content=media_url(file_path),
             media_type="application/octet-stream",
             headers={"Content-Disposition": f"attachment; filename={file_name}"},
         )
-    raise ValueError("Either content or file_path must be provided.")
\ No newline at end of file
+    raise ValueError("Either content or file_path must be provided.")
+
+
+def make_file_response(
+    data: bytes,
+    file_name: str,
+    media_type: str = "application/pdf",
+) -> Response:
+    """The function creates a response with the content of a file.
+
+    Unlike make_response, the client gets the file itself rather than a URL
+    to download it from, and the length is known upfront.
+
+    Args:
+        data (bytes): Content of the file.
+        file_name (str): File name offered to the client.
+        media_type (str, optional): Media type of the file.
+            Defaults to "application/pdf".
+
+    Returns:
+        Response: Response with the file and its Content-Length.
+    """
+    return Response(
+        content=data,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+    )
+
+
+def sse_event(event: str, data: dict[str, Any]) -> str:
+    """The function formats one Server-Sent Event.
+
+    Args:
+        event (str): Event name.
+        data (dict[str, Any]): JSON-serializable event payload.
+
+    Returns:
+        str: Event in the text/event-stream format.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
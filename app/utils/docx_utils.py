@@ -0,0 +1,153 @@
+import zipfile
+from typing import IO, BinaryIO, Iterable, Iterator, Union
+
+from lxml import etree
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY = f"{_W}body"
+_P = f"{_W}p"
+_TBL = f"{_W}tbl"
+_TR = f"{_W}tr"
+_TC = f"{_W}tc"
+_TEXT_TAGS = (f"{_W}t", f"{_W}tab", f"{_W}br", f"{_W}cr")
+
+
+class DocxError(Exception):
+    """Raised when a file can't be read as a .docx document."""
+
+
+def iter_docx(file: BinaryIO) -> Iterator[Union[str, list[str]]]:
+    """
+    Stream the body of a .docx document.
+
+    ``word/document.xml`` is parsed incrementally straight out of the zip,
+    and every paragraph or table row is dropped once yielded, so memory
+    stays flat however long the document is. Only top-level paragraphs and
+    tables are yielded, like python-docx's ``Document.paragraphs`` and
+    ``Document.tables``.
+
+    :param file: .docx file.
+    :raises DocxError: if the file isn't a .docx document.
+    :yield: text of a paragraph, or the cell texts of a table row, with
+        merged cells repeated as in python-docx's ``row.cells``.
+    """
+    try:
+        with zipfile.ZipFile(file) as archive, archive.open("word/document.xml") as xml:
+            yield from _iter_body(xml)
+    except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as error:
+        raise DocxError(str(error)) from error
+
+
+def iter_paragraphs(file: BinaryIO) -> Iterator[str]:
+    """
+    Stream the text of the top-level paragraphs of a .docx document.
+
+    :param file: .docx file.
+    :raises DocxError: if the file isn't a .docx document.
+    :yield: text of a paragraph.
+    """
+    for item in iter_docx(file):
+        if isinstance(item, str):
+            yield item
+
+
+def iter_table_pairs(file: BinaryIO) -> Iterator[tuple[str, str]]:
+    """
+    Stream the first two cells of every table row of a .docx document.
+
+    :param file: .docx file.
+    :raises DocxError: if the file isn't a .docx document.
+    :yield: stripped text of the first and second cell.
+    """
+    for item in iter_docx(file):
+        if isinstance(item, list) and len(item) >= 2:
+            yield item[0].strip(), item[1].strip()
+
+
+def extract_table_fields(file: BinaryIO, keys: Iterable[str]) -> dict[str, str]:
+    """
+    Find values next to the given keys in the tables of a .docx document.
+
+    Parsing stops as soon as every key is found, so for a form at the top
+    of a long document only its first rows are read.
+
+    :param file: .docx file.
+    :param keys: texts of the first cells to look for.
+    :raises DocxError: if the file isn't a .docx document.
+    :return: first value found for each key, missing keys are left out.
+    """
+    wanted = set(keys)
+    found: dict[str, str] = {}
+    for key, value in iter_table_pairs(file):
+        if key in wanted and key not in found:
+            found[key] = value
+            if len(found) == len(wanted):
+                break
+    return found
+
+
+def _iter_body(xml: IO[bytes]) -> Iterator[Union[str, list[str]]]:
+    previous_row: list[str] = []
+    # Entities and network lookups are off: documents come from users.
+    events = etree.iterparse(
+        xml,
+        events=("end",),
+        tag=(_P, _TR, _TBL),
+        resolve_entities=False,
+        no_network=True,
+    )
+    for _, element in events:
+        parent = element.getparent()
+        if element.tag == _P and parent.tag == _BODY:
+            yield _paragraph_text(element)
+            _drop(element)
+        elif element.tag == _TR and parent.getparent().tag == _BODY:
+            previous_row = _row_cells(element, previous_row)
+            yield previous_row
+            _drop(element)
+        elif element.tag == _TBL and parent.tag == _BODY:
+            previous_row = []
+            _drop(element)
+
+
+def _paragraph_text(paragraph: etree._Element) -> str:
+    parts = []
+    for node in paragraph.iter(*_TEXT_TAGS):
+        if node.tag == _TEXT_TAGS[0]:
+            parts.append(node.text or "")
+        elif node.tag == _TEXT_TAGS[1]:
+            parts.append("\t")
+        else:
+            parts.append("\n")
+    return "".join(parts)
+
+
+def _row_cells(row: etree._Element, previous_row: list[str]) -> list[str]:
+    cells: list[str] = []
+    for cell in row.iterchildren(_TC):
+        properties = cell.find(f"{_W}tcPr")
+        span = 1
+        merged = False
+        if properties is not None:
+            grid_span = properties.find(f"{_W}gridSpan")
+            if grid_span is not None:
+                span = int(grid_span.get(f"{_W}val", "1"))
+            v_merge = properties.find(f"{_W}vMerge")
+            merged = v_merge is not None and v_merge.get(f"{_W}val") != "restart"
+        column = len(cells)
+        if merged and column < len(previous_row):
+            # Continuation of a vertically merged cell shows the cell above.
+            text = previous_row[column]
+        else:
+            text = "\n".join(
+                _paragraph_text(paragraph) for paragraph in cell.iterchildren(_P)
+            )
+        cells.extend([text] * span)
+    return cells
+
+
+def _drop(element: etree._Element) -> None:
+    element.clear()
+    parent = element.getparent()
+    while element.getprevious() is not None:
+        del parent[0]
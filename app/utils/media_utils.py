@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+_MEDIA_NAME = re.compile(r".+-(?P<digest>[0-9a-f]{32})\.[A-Za-z0-9]+")
+
+
+def media_name(kind: str, inputs: Any, suffix: str) -> str:
+    """The function names an artifact after a hash of its inputs.
+
+    The same inputs always give the same name, so a generated artifact can be
+    found again without rendering it, and different requests never share a file.
+
+    Args:
+        kind (str): Kind of artifact, also used as the name prefix. Bump it
+            (e.g. "newsletter-v2") when the layout changes.
+        inputs (Any): JSON-serializable inputs the artifact is rendered from.
+        suffix (str): File extension, including the dot.
+
+    Returns:
+        str: File name of the artifact.
+    """
+    payload = json.dumps([kind, inputs], sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{kind}-{digest[:32]}{suffix}"
+
+
+def media_digest(file_name: str) -> Optional[str]:
+    """The function gets the hash from the name of an artifact.
+
+    Args:
+        file_name (str): File name of the artifact.
+
+    Returns:
+        Optional[str]: Hash of its inputs, None if the name doesn't come
+            from media_name.
+    """
+    match = _MEDIA_NAME.fullmatch(file_name)
+    return match.group("digest") if match else None
+
+
+@contextmanager
+def atomic_output(path: Path) -> Iterator[str]:
+    """The function yields a temporary path that replaces path once written.
+
+    The temporary file is created next to the target, so the final rename is
+    atomic and readers never see a partially written artifact. It is removed
+    if writing fails.
+
+    Args:
+        path (Path): Final path of the file.
+
+    Yields:
+        str: Temporary path to write the file to.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    os.close(fd)
+    temp = Path(temp_path)
+    try:
+        yield temp_path
+        temp.chmod(0o644)  # mkstemp files are private to the owner
+        temp.replace(path)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+def save_media(path: Path, data: bytes) -> None:
+    """The function atomically writes an artifact.
+
+    Args:
+        path (Path): Path of the artifact.
+        data (bytes): Content of the artifact.
+    """
+    with atomic_output(path) as temp_path:
+        Path(temp_path).write_bytes(data)
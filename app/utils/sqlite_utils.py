@@ -0,0 +1,24 @@
+import sqlite3
+from pathlib import Path
+
+
+def connect_sqlite(path: Path) -> sqlite3.Connection:
+    """
+    Open a SQLite database that is shared between worker processes.
+
+    The parent directory is created if needed and the database is switched
+    to WAL mode, so readers in one worker don't block writers in another.
+
+    :param path: path to the database file.
+    :return: open connection, usable from any thread.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(
+        str(path),
+        timeout=30,
+        check_same_thread=False,
+        isolation_level=None,
+    )
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
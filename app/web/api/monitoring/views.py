@@ -1,4 +1,7 @@
+from typing import Any
+
 from fastapi import APIRouter
+from starlette.requests import Request
 
 router = APIRouter()
 
@@ -10,3 +13,25 @@ def health_check() -> None:
 
     It returns 200 if the project is healthy.
     """
+
+
+@router.get("/metrics")
+def metrics(request: Request) -> dict[str, Any]:
+    """
+    Reports runtime counters of the project's services.
+
+    :param request: current request.
+    :return: counters grouped by service.
+    """
+    llm_cache = request.app.state.llm_cache
+    return {
+        "llm_cache": llm_cache.stats() if llm_cache is not None else None,
+        "gemini": request.app.state.gemini_client.stats(),
+        "transcription": request.app.state.transcription_pool.stats(),
+        "transcripts": request.app.state.transcript_store.stats(),
+        "workspaces": request.app.state.workspaces.stats(),
+        "jobs": request.app.state.job_manager.stats(),
+        "media": request.app.state.media_store.stats(),
+        "documents": request.app.state.document_downloader.stats(),
+        "coalescing": request.app.state.coalescer.stats(),
+    }
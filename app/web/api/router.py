@@ -1,80 +1,372 @@
-import os
-import uuid
-import traceback
+import asyncio
 import logging
+import math
+import traceback
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from app.core.settings import PdfDelivery, settings
 from app.repositories.generate_text import (
     extract_and_summarize,
-    generate_overview_short,
-    narrative_generator,
-    create_newsletter_pdf,
+    generate_newsletter_content,
+    newsletter_pdf_name,
+    render_newsletter_pdf,
+)
+from app.repositories.topic_hook import (
+    generate_lesson_intro,
+    render_topichook_pdf,
+    topichook_pdf_name,
+)
+from app.repositories.youtube import (
+    extract_video_id,
+    fetch_transcript,
+    stream_summary,
+    summarizeyt_with_gemini,
+)
+from app.services.coalescing import Coalescer, get_coalescer
+from app.services.documents import DocumentDownloader, get_document_downloader
+from app.services.gemini import GeminiClient, GeminiQuotaError, get_gemini_client
+from app.services.jobs import (
+    JobManager,
+    JobQueueFullError,
+    JobStatus,
+    get_job_manager,
+)
+from app.services.media import MediaStore, get_media_store
+from app.services.pdf import PdfRenderPool, get_pdf_renderer
+from app.services.transcription import (
+    TranscriptionBusyError,
+    TranscriptionPool,
+    get_transcription_pool,
 )
-from app.repositories.topic_hook import generate_lesson_intro, create_topichook_pdf
-from app.core.settings import settings
-from app.repositories.youtube import fetch_transcript, summarizeyt_with_gemini
-from app.utils.api_utils import make_response
+from app.services.transcripts import TranscriptStore, get_transcript_store
+from app.services.workspaces import (
+    WorkspaceManager,
+    WorkspaceQuotaError,
+    get_workspaces,
+)
+from app.utils.api_utils import (
+    make_file_response,
+    make_response,
+    media_url,
+    sse_event,
+)
+from app.web.api import monitoring
 
 logger = logging.getLogger(__name__)
 
 api_router = APIRouter()
+api_router.include_router(monitoring.router)
+
+# Coalescing key of a request.
+RequestKey = tuple[Any, ...]
+# Renders a PDF once it is known how it is delivered.
+PdfRender = Callable[[], Awaitable[bytes]]
+# Generates the content of a PDF and returns its file name and renderer.
+PdfPipeline = Callable[[], Awaitable[tuple[str, PdfRender]]]
+
+
+def _quota_exceeded(quota_error: GeminiQuotaError) -> HTTPException:
+    """Turns running out of Gemini quota into a 429 that says when to try again."""
+    headers = None
+    if quota_error.retry_after is not None:
+        headers = {"Retry-After": str(math.ceil(quota_error.retry_after))}
+    return HTTPException(status_code=429, detail=str(quota_error), headers=headers)
+
+
+def _normalize(value: Optional[str]) -> Optional[str]:
+    """Normalizes a parameter, so requests that only differ in spacing coalesce."""
+    return " ".join(value.split()) if value is not None else None
+
+
+def _request_key(kind: str, *params: Optional[str]) -> RequestKey:
+    """Builds the coalescing key of a request from its kind and parameters."""
+    return (kind, *(_normalize(param) for param in params))
+
+
+def _summary_key(video_url: str, language: str) -> RequestKey:
+    """Builds the coalescing key of a video summary, the video ID and the language."""
+    video_id = extract_video_id(video_url) or _normalize(video_url)
+    return ("summarize_video", video_id, " ".join(language.split()).casefold())
+
+
+async def _newsletter_pipeline(
+    gemini: GeminiClient,
+    renderer: PdfRenderPool,
+    downloader: DocumentDownloader,
+    name: Optional[str],
+    past_activities: Optional[str],
+    future_plans: Optional[str],
+    announcement: Optional[str],
+    file_url: Optional[str],
+) -> tuple[str, PdfRender]:
+    """Generates the content of a newsletter and returns the PDF's name and renderer."""
+    # If user provides manual input, use it. Otherwise, extract from file.
+    if name and past_activities and future_plans and announcement:
+        pass  # Already assigned via query params
+    elif file_url:
+        name, past_activities, future_plans, announcement = await extract_and_summarize(
+            downloader,
+            file_url,
+        )
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="Either provide manual input or a file URL.",
+        )
+
+    # Generate the overview and the section narratives concurrently
+    (
+        overview_text,
+        past_activities,
+        future_plans,
+        announcement,
+    ) = await generate_newsletter_content(
+        gemini,
+        past_activities,
+        future_plans,
+        announcement,
+    )
+
+    # Prepare section data (replaces table structure)
+    section_data = {
+        "Last Week's Activities": past_activities,
+        "Future Plans": future_plans,
+        "Announcements": announcement,
+    }
+
+    # The PDF with sections is rendered once it is known how to deliver it
+    return (
+        newsletter_pdf_name(renderer, name, overview_text, section_data),
+        partial(render_newsletter_pdf, renderer, name, overview_text, section_data),
+    )
+
+
+def _newsletter_request(
+    gemini: GeminiClient,
+    renderer: PdfRenderPool,
+    downloader: DocumentDownloader,
+    name: Optional[str],
+    past_activities: Optional[str],
+    future_plans: Optional[str],
+    announcement: Optional[str],
+    file_url: Optional[str],
+) -> tuple[RequestKey, PdfPipeline]:
+    """Builds the coalescing key and the pipeline of a newsletter request."""
+    key = _request_key(
+        "newsletter",
+        name,
+        past_activities,
+        future_plans,
+        announcement,
+        file_url,
+    )
+    pipeline = partial(
+        _newsletter_pipeline,
+        gemini,
+        renderer,
+        downloader,
+        name,
+        past_activities,
+        future_plans,
+        announcement,
+        file_url,
+    )
+    return key, pipeline
+
+
+async def _persist_pdf(
+    coalescer: Coalescer,
+    media: MediaStore,
+    key: RequestKey,
+    pipeline: PdfPipeline,
+) -> Path:
+    """
+    Runs a PDF pipeline and saves the PDF to the media store, unless it was already.
+
+    Identical requests in flight share one run.
+    """
+
+    async def persist() -> Path:
+        file_name, render = await pipeline()
+        return await media.persist(file_name, render)
+
+    return await coalescer.run(key, persist)
+
+
+async def _deliver_pdf(
+    coalescer: Coalescer,
+    media: MediaStore,
+    key: RequestKey,
+    pipeline: PdfPipeline,
+) -> Response:
+    """
+    Runs a PDF pipeline and returns the PDF the way settings.pdf_delivery asks for.
+
+    As bytes, the PDF is rendered in memory and sent in the response itself, and only
+    saved to the media store if settings.pdf_persist is on. As a URL, it is saved
+    to the media store, unless it was saved before, and the response links to it.
+    Identical requests in flight share one run.
+    """
+    if settings.pdf_delivery == PdfDelivery.BYTES:
+
+        async def render_pdf() -> tuple[str, bytes]:
+            file_name, render = await pipeline()
+            data = await render()
+            # A saved PDF is never rewritten, its name is its ETag
+            if settings.pdf_persist and not media.path(file_name).exists():
+                await media.save(file_name, data)
+            return file_name, data
+
+        file_name, data = await coalescer.run((*key, "bytes"), render_pdf)
+        return make_file_response(data, file_name)
+
+    pdf_path = await _persist_pdf(coalescer, media, key, pipeline)
+    return make_response(file_path=str(pdf_path))
 
 
 @api_router.post("/generate-newsletter")
-def generate_newsletter(
+async def generate_newsletter(
     name: str = Query(None),
     past_activities: str = Query(None),
     future_plans: str = Query(None),
     announcement: str = Query(None),
-    file_url: str = Query(None)
-):
+    file_url: str = Query(None),
+    gemini: GeminiClient = Depends(get_gemini_client),
+    renderer: PdfRenderPool = Depends(get_pdf_renderer),
+    media: MediaStore = Depends(get_media_store),
+    downloader: DocumentDownloader = Depends(get_document_downloader),
+    coalescer: Coalescer = Depends(get_coalescer),
+) -> Response:
     """
-    Generates a class newsletter PDF from either manually entered data or extracted text from a file.
+    Generates a class newsletter PDF.
+
+    The content is either entered manually or extracted from the file at file_url.
     """
+    key, pipeline = _newsletter_request(
+        gemini,
+        renderer,
+        downloader,
+        name,
+        past_activities,
+        future_plans,
+        announcement,
+        file_url,
+    )
     try:
-        # If user provides manual input, use it. Otherwise, extract from file.
-        if name and past_activities and future_plans and announcement:
-            pass  # Already assigned via query params
-        elif file_url:
-            name, past_activities, future_plans, announcement = extract_and_summarize(file_url)
-        else:
-            raise HTTPException(
-                status_code=400, detail="Either provide manual input or a file URL."
-            )
+        return await _deliver_pdf(coalescer, media, key, pipeline)
 
-        # Generate an overview
-        overview_text = generate_overview_short(
-            past_activities, future_plans, announcement
-        )
+    except HTTPException as http_error:
+        raise http_error  # Re-raise without modifying the error
+    except GeminiQuotaError as quota_error:
+        raise _quota_exceeded(quota_error) from quota_error
+    except Exception as error:
+        logger.error(traceback.format_exc())
+        raise HTTPException(
+            status_code=500,
+            detail=f"Unexpected error: {error!s}",
+        ) from error
 
-        # Generate narratives for each section
-        past_activities, future_plans, announcement = narrative_generator(
-            past_activities, future_plans, announcement
-        )
 
-        # Prepare section data (replaces table structure)
-        section_data = {
-            "Last Week's Activities": past_activities,
-            "Future Plans": future_plans,
-            "Announcements": announcement,
-        }
+@api_router.post("/generate-newsletter/jobs", status_code=202)
+async def submit_newsletter_job(
+    name: str = Query(None),
+    past_activities: str = Query(None),
+    future_plans: str = Query(None),
+    announcement: str = Query(None),
+    file_url: str = Query(None),
+    gemini: GeminiClient = Depends(get_gemini_client),
+    renderer: PdfRenderPool = Depends(get_pdf_renderer),
+    media: MediaStore = Depends(get_media_store),
+    downloader: DocumentDownloader = Depends(get_document_downloader),
+    jobs: JobManager = Depends(get_job_manager),
+    coalescer: Coalescer = Depends(get_coalescer),
+) -> JSONResponse:
+    """Starts generating a newsletter PDF in the background and returns the job ID."""
+    key, pipeline = _newsletter_request(
+        gemini,
+        renderer,
+        downloader,
+        name,
+        past_activities,
+        future_plans,
+        announcement,
+        file_url,
+    )
 
-        # Create the PDF with sections
-        pdf_path = create_newsletter_pdf(name, overview_text, section_data)
+    async def run() -> dict[str, str]:
+        pdf_path = await _persist_pdf(coalescer, media, key, pipeline)
+        return {"url": media_url(str(pdf_path))}
 
-        if not pdf_path:
-            raise HTTPException(
-                status_code=500, detail="Failed to generate the newsletter PDF."
-            )
+    return await _submit_job(jobs, "newsletter", run)
 
-        return make_response(file_path=pdf_path)
 
-    except HTTPException as http_error:
-        raise http_error  # Re-raise without modifying the error
-    except Exception as error:
-        logger.error(traceback.print_exc())
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(error)}")
+async def _lesson_intro_pipeline(
+    gemini: GeminiClient,
+    renderer: PdfRenderPool,
+    downloader: DocumentDownloader,
+    topic: str,
+    audience: str,
+    hook_style: str,
+    learning_objective: str,
+    duration: str,
+    file_url: Optional[str],
+) -> tuple[str, PdfRender]:
+    """Generates a lesson introduction and returns the PDF's name and renderer."""
+    lesson_intro = await generate_lesson_intro(
+        gemini,
+        downloader,
+        topic,
+        audience,
+        hook_style,
+        learning_objective,
+        duration,
+        file_url,
+    )
+    return (
+        topichook_pdf_name(renderer, lesson_intro),
+        partial(render_topichook_pdf, renderer, lesson_intro),
+    )
+
+
+def _lesson_intro_request(
+    gemini: GeminiClient,
+    renderer: PdfRenderPool,
+    downloader: DocumentDownloader,
+    topic: str,
+    audience: str,
+    hook_style: str,
+    learning_objective: str,
+    duration: str,
+    file_url: Optional[str],
+) -> tuple[RequestKey, PdfPipeline]:
+    """Builds the coalescing key and the pipeline of a lesson introduction request."""
+    key = _request_key(
+        "lesson_intro",
+        topic,
+        audience,
+        hook_style,
+        learning_objective,
+        duration,
+        file_url,
+    )
+    pipeline = partial(
+        _lesson_intro_pipeline,
+        gemini,
+        renderer,
+        downloader,
+        topic,
+        audience,
+        hook_style,
+        learning_objective,
+        duration,
+        file_url,
+    )
+    return key, pipeline
 
 
 @api_router.post("/generate_lesson_intro")
@@ -84,45 +376,312 @@ async def api_generate_lesson_intro(
     hook_style: str = Query(...),
     learning_objective: str = Query(...),
     duration: str = Query(...),
-    file_url: str = Query(None)
-):
-    """
-    API endpoint to generate a lesson introduction dynamically.
-    """
+    file_url: str = Query(None),
+    gemini: GeminiClient = Depends(get_gemini_client),
+    renderer: PdfRenderPool = Depends(get_pdf_renderer),
+    media: MediaStore = Depends(get_media_store),
+    downloader: DocumentDownloader = Depends(get_document_downloader),
+    coalescer: Coalescer = Depends(get_coalescer),
+) -> Response:
+    """API endpoint to generate a lesson introduction dynamically."""
+    key, pipeline = _lesson_intro_request(
+        gemini,
+        renderer,
+        downloader,
+        topic,
+        audience,
+        hook_style,
+        learning_objective,
+        duration,
+        file_url,
+    )
     try:
-        lesson_intro = generate_lesson_intro(
-            topic, audience, hook_style, learning_objective, duration, file_url
-        )
-        filename = create_topichook_pdf(lesson_intro)
-        return make_response(file_path=filename)
+        return await _deliver_pdf(coalescer, media, key, pipeline)
 
     except HTTPException as http_error:
         raise http_error
+    except GeminiQuotaError as quota_error:
+        raise _quota_exceeded(quota_error) from quota_error
     except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(error)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Unexpected error: {error!s}",
+        ) from error
 
 
-@api_router.post("/summarize_video")
-async def summarize_video(
-    video_url: str = Query(...),
-    language: str = Query(...)
-):
-    """
-    Extracts the transcript of a YouTube video and summarizes it in the requested language.
-    """
+@api_router.post("/generate_lesson_intro/jobs", status_code=202)
+async def submit_lesson_intro_job(
+    topic: str = Query(...),
+    audience: str = Query(...),
+    hook_style: str = Query(...),
+    learning_objective: str = Query(...),
+    duration: str = Query(...),
+    file_url: str = Query(None),
+    gemini: GeminiClient = Depends(get_gemini_client),
+    renderer: PdfRenderPool = Depends(get_pdf_renderer),
+    media: MediaStore = Depends(get_media_store),
+    downloader: DocumentDownloader = Depends(get_document_downloader),
+    jobs: JobManager = Depends(get_job_manager),
+    coalescer: Coalescer = Depends(get_coalescer),
+) -> JSONResponse:
+    """Starts generating a lesson introduction in the background, returns the job ID."""
+    key, pipeline = _lesson_intro_request(
+        gemini,
+        renderer,
+        downloader,
+        topic,
+        audience,
+        hook_style,
+        learning_objective,
+        duration,
+        file_url,
+    )
+
+    async def run() -> dict[str, str]:
+        pdf_path = await _persist_pdf(coalescer, media, key, pipeline)
+        return {"url": media_url(str(pdf_path))}
+
+    return await _submit_job(jobs, "lesson_intro", run)
+
+
+async def _summary_pipeline(
+    video_url: str,
+    language: str,
+    gemini: GeminiClient,
+    transcription_pool: TranscriptionPool,
+    transcript_store: TranscriptStore,
+    workspaces: WorkspaceManager,
+) -> str:
+    """Extracts the transcript of a YouTube video and returns its summary."""
     try:
         #  Fetch transcript
-        transcript, error = fetch_transcript(video_url)
+        transcript, error = await fetch_transcript(
+            video_url,
+            transcription_pool,
+            transcript_store,
+            workspaces,
+        )
+    except (TranscriptionBusyError, WorkspaceQuotaError) as busy_error:
+        raise HTTPException(status_code=503, detail=str(busy_error)) from busy_error
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="Transcription timed out.",
+        ) from None
 
-        if error:
-            raise HTTPException(status_code=400, detail=error)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
 
-        # Generate Summary
-        summary = summarizeyt_with_gemini(transcript, language)
+    # Generate Summary
+    return await summarizeyt_with_gemini(gemini, transcript, language)
 
+
+def _summary_request(
+    video_url: str,
+    language: str,
+    gemini: GeminiClient,
+    transcription_pool: TranscriptionPool,
+    transcript_store: TranscriptStore,
+    workspaces: WorkspaceManager,
+) -> tuple[RequestKey, Callable[[], Awaitable[str]]]:
+    """Builds the coalescing key and the pipeline of a video summary request."""
+    pipeline = partial(
+        _summary_pipeline,
+        video_url,
+        language,
+        gemini,
+        transcription_pool,
+        transcript_store,
+        workspaces,
+    )
+    return _summary_key(video_url, language), pipeline
+
+
+@api_router.post("/summarize_video")
+async def summarize_video(
+    video_url: str = Query(...),
+    language: str = Query(...),
+    gemini: GeminiClient = Depends(get_gemini_client),
+    transcription_pool: TranscriptionPool = Depends(get_transcription_pool),
+    transcript_store: TranscriptStore = Depends(get_transcript_store),
+    workspaces: WorkspaceManager = Depends(get_workspaces),
+    coalescer: Coalescer = Depends(get_coalescer),
+) -> JSONResponse:
+    """Summarizes the transcript of a YouTube video in the requested language."""
+    key, pipeline = _summary_request(
+        video_url,
+        language,
+        gemini,
+        transcription_pool,
+        transcript_store,
+        workspaces,
+    )
+    try:
+        summary = await coalescer.run(key, pipeline)
         return JSONResponse(content={"summary": summary}, status_code=200)
 
     except HTTPException as http_error:
         raise http_error
+    except GeminiQuotaError as quota_error:
+        raise _quota_exceeded(quota_error) from quota_error
     except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(error)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Unexpected error: {error!s}",
+        ) from error
+
+
+@api_router.post("/summarize_video/jobs", status_code=202)
+async def submit_summarize_video_job(
+    video_url: str = Query(...),
+    language: str = Query(...),
+    gemini: GeminiClient = Depends(get_gemini_client),
+    transcription_pool: TranscriptionPool = Depends(get_transcription_pool),
+    transcript_store: TranscriptStore = Depends(get_transcript_store),
+    workspaces: WorkspaceManager = Depends(get_workspaces),
+    jobs: JobManager = Depends(get_job_manager),
+    coalescer: Coalescer = Depends(get_coalescer),
+) -> JSONResponse:
+    """Starts summarizing a YouTube video in the background and returns the job ID."""
+    key, pipeline = _summary_request(
+        video_url,
+        language,
+        gemini,
+        transcription_pool,
+        transcript_store,
+        workspaces,
+    )
+
+    async def run() -> dict[str, str]:
+        summary = await coalescer.run(key, pipeline)
+        return {"summary": summary}
+
+    return await _submit_job(jobs, "summarize_video", run)
+
+
+async def _summary_events(
+    video_url: str,
+    language: str,
+    gemini: GeminiClient,
+    transcription_pool: TranscriptionPool,
+    transcript_store: TranscriptStore,
+    workspaces: WorkspaceManager,
+) -> AsyncIterator[str]:
+    """Runs the video summary pipeline, yielding its progress as Server-Sent Events."""
+    events: asyncio.Queue[Optional[str]] = asyncio.Queue()
+
+    def progress(event: str, data: dict[str, Any]) -> None:
+        events.put_nowait(sse_event(event, data))
+
+    async def run_pipeline() -> None:
+        try:
+            transcript, error = await fetch_transcript(
+                video_url,
+                transcription_pool,
+                transcript_store,
+                workspaces,
+                progress,
+            )
+            if error:
+                progress("error", {"status_code": 400, "detail": error})
+                return
+            async for text in stream_summary(gemini, transcript, language):
+                progress("summary", {"text": text})
+            progress("done", {})
+        except (TranscriptionBusyError, WorkspaceQuotaError) as busy_error:
+            progress("error", {"status_code": 503, "detail": str(busy_error)})
+        except asyncio.TimeoutError:
+            progress(
+                "error",
+                {"status_code": 504, "detail": "Transcription timed out."},
+            )
+        except GeminiQuotaError as quota_error:
+            progress(
+                "error",
+                {
+                    "status_code": 429,
+                    "detail": str(quota_error),
+                    "retry_after": quota_error.retry_after,
+                },
+            )
+        except Exception as error:
+            logger.error(traceback.format_exc())
+            progress(
+                "error",
+                {"status_code": 500, "detail": f"Unexpected error: {error!s}"},
+            )
+        finally:
+            events.put_nowait(None)
+
+    pipeline = asyncio.create_task(run_pipeline())
+    try:
+        while (event := await events.get()) is not None:
+            yield event
+    finally:
+        # The client went away, stop working on its summary
+        pipeline.cancel()
+
+
+@api_router.api_route("/summarize_video/stream", methods=["GET", "POST"])
+async def summarize_video_stream(
+    video_url: str = Query(...),
+    language: str = Query(...),
+    gemini: GeminiClient = Depends(get_gemini_client),
+    transcription_pool: TranscriptionPool = Depends(get_transcription_pool),
+    transcript_store: TranscriptStore = Depends(get_transcript_store),
+    workspaces: WorkspaceManager = Depends(get_workspaces),
+) -> StreamingResponse:
+    """
+    Streams the summary of a YouTube video as Server-Sent Events.
+
+    Emits `transcript_source` once the transcript is chosen, `transcription`
+    while Whisper runs, `summary` for every piece of text Gemini streams, then
+    `done` or `error`.
+    """
+    return StreamingResponse(
+        _summary_events(
+            video_url,
+            language,
+            gemini,
+            transcription_pool,
+            transcript_store,
+            workspaces,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _submit_job(
+    jobs: JobManager,
+    kind: str,
+    run: Callable[[], Awaitable[Any]],
+) -> JSONResponse:
+    """Queues a pipeline in the background executor and answers with its job ID."""
+
+    async def run_job() -> Any:
+        try:
+            return await run()
+        except GeminiQuotaError as quota_error:
+            raise _quota_exceeded(quota_error) from quota_error
+
+    try:
+        job_id = await jobs.submit(kind, run_job)
+    except JobQueueFullError as queue_error:
+        raise HTTPException(status_code=503, detail=str(queue_error)) from queue_error
+    return JSONResponse(
+        content={"job_id": job_id, "status": JobStatus.PENDING.value},
+        status_code=202,
+    )
+
+
+@api_router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    jobs: JobManager = Depends(get_job_manager),
+) -> JSONResponse:
+    """Returns the status of a background job, and its result or error once done."""
+    job = await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+    return JSONResponse(content=job, status_code=200)
@@ -1,10 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import UJSONResponse
-from fastapi.staticfiles import StaticFiles
 
-import google.generativeai as genai
 from app.core.settings import settings
+from app.services.media import MediaFiles
 from app.utils.log_utils import configure_logging
 from app.web.api.router import api_router
 from app.web.lifespan import lifespan_setup
@@ -21,13 +20,6 @@ def get_app() -> FastAPI:
     # Configure logging for the application
     configure_logging()
 
-    # Configure the Gemini API explicitly
-    try:
-        genai.configure(api_key=settings.gemini_key)
-        print("Gemini API successfully configured.")
-    except Exception as e:
-        print(f"Failed to configure Gemini API: {e}")
-
     # Create FastAPI application
     app = FastAPI(
         title=settings.title,
@@ -58,10 +50,11 @@ def get_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Serve static files
+    # Serve static files with HTTP caching, the directory is created once here
+    settings.media_dir_static.mkdir(parents=True, exist_ok=True)
     app.mount(
         "/static/media",
-        StaticFiles(directory=settings.media_dir_static),
+        MediaFiles(directory=settings.media_dir_static),
         name="media",
     )
 
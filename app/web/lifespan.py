@@ -7,6 +7,22 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from app.core.settings import settings
 from app.db.meta import meta
 from app.db.models import load_all_models
+from app.services.coalescing.lifespan import init_coalescer
+from app.services.documents.lifespan import init_documents
+from app.services.gemini.lifespan import init_gemini, shutdown_gemini
+from app.services.http.lifespan import init_http_client, shutdown_http_client
+from app.services.jobs.lifespan import init_jobs, shutdown_jobs
+from app.services.media.lifespan import init_media_store, shutdown_media_store
+from app.services.pdf.lifespan import init_pdf_renderer, shutdown_pdf_renderer
+from app.services.transcription.lifespan import (
+    init_transcription,
+    shutdown_transcription,
+)
+from app.services.transcripts.lifespan import (
+    init_transcript_store,
+    shutdown_transcript_store,
+)
+from app.services.workspaces.lifespan import init_workspaces
 
 
 def _setup_db(app: FastAPI) -> None:  # pragma: no cover
@@ -53,8 +69,25 @@ async def lifespan_setup(
 
     app.middleware_stack = None
     _setup_db(app)
+    init_gemini(app)
+    await init_transcription(app)
+    await init_transcript_store(app)
+    init_workspaces(app)
+    await init_pdf_renderer(app)
+    init_media_store(app)
+    init_http_client(app)
+    init_documents(app)
+    init_coalescer(app)
+    init_jobs(app)
     await _create_tables()
     app.middleware_stack = app.build_middleware_stack()
 
     yield
+    await shutdown_jobs(app)
     await app.state.db_engine.dispose()
+    await shutdown_gemini(app)
+    shutdown_transcription(app)
+    shutdown_transcript_store(app)
+    shutdown_pdf_renderer(app)
+    await shutdown_media_store(app)
+    await shutdown_http_client(app)
@@ -0,0 +1,114 @@
+"""
+Compare python-docx with the streaming .docx extractor.
+
+Usage::
+
+    python -m benchmarks.docx_extract --rows 300 --paragraphs 2000
+
+A newsletter form is put at the top of a document padded with a long table
+and many paragraphs, like a report pasted under the form, then the form
+fields and the paragraph text are extracted both ways.
+"""
+
+import argparse
+import io
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+from docx import Document
+
+from app.utils.docx_utils import extract_table_fields, iter_paragraphs
+
+FIELDS = {
+    "Name of the Class": "Class 5A",
+    "Last week\u2019s Activities": "Weather log and group presentations.",
+    "Next week\u2019s Activities": "Field trip to the science museum.",
+    "Special Announcement": "Parents' evening on Friday.",
+}
+
+
+def _document(rows: int, paragraphs: int) -> bytes:
+    document = Document()
+    form = document.add_table(rows=len(FIELDS), cols=2)
+    for row, (key, value) in zip(form.rows, FIELDS.items()):
+        row.cells[0].text = key
+        row.cells[1].text = value
+    padding = document.add_table(rows=rows, cols=3)
+    for index, row in enumerate(padding.rows):
+        for cell in row.cells:
+            cell.text = f"Row {index} of the attendance report"
+    for index in range(paragraphs):
+        document.add_paragraph(f"Paragraph {index} of the weekly report, " * 4)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _python_docx_fields(data: bytes) -> dict[str, str]:
+    found = {}
+    for table in Document(io.BytesIO(data)).tables:
+        for row in table.rows:
+            key = row.cells[0].text.strip()
+            if key in FIELDS:
+                found[key] = row.cells[1].text.strip()
+    return found
+
+
+def _python_docx_text(data: bytes) -> str:
+    document = Document(io.BytesIO(data))
+    return "\n".join(p.text for p in document.paragraphs if p.text.strip())
+
+
+def _streaming_fields(data: bytes) -> dict[str, str]:
+    return extract_table_fields(io.BytesIO(data), FIELDS)
+
+
+def _streaming_text(data: bytes) -> str:
+    return "\n".join(t for t in iter_paragraphs(io.BytesIO(data)) if t.strip())
+
+
+def _measure(
+    extract: Callable[[bytes], object],
+    data: bytes,
+    runs: int,
+) -> tuple[float, float]:
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        extract(data)
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    extract(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times) * 1000, peak / 2**20
+
+
+def _main(rows: int, paragraphs: int, runs: int) -> None:
+    data = _document(rows, paragraphs)
+    if not _python_docx_fields(data) == _streaming_fields(data) == FIELDS:
+        raise RuntimeError("The extractors found different form fields.")
+    if _python_docx_text(data) != _streaming_text(data):
+        raise RuntimeError("The extractors found different paragraph text.")
+    print(  # noqa: T201
+        f"rows: {rows}, paragraphs: {paragraphs}, size: {len(data) / 1024:.0f} KiB",
+    )
+    for name, extract in (
+        ("fields python-docx", _python_docx_fields),
+        ("fields streaming", _streaming_fields),
+        ("text python-docx", _python_docx_text),
+        ("text streaming", _streaming_text),
+    ):
+        median, peak = _measure(extract, data, runs)
+        print(f"{name:<19} {median:8.1f} ms {peak:8.1f} MiB peak")  # noqa: T201
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    _main(args.rows, args.paragraphs, args.runs)
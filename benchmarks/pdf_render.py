@@ -0,0 +1,69 @@
+"""
+Compare the fpdf and PyMuPDF renderers.
+
+Usage::
+
+    python -m benchmarks.pdf_render --runs 50
+
+Both renderers lay out the same Latin newsletter and lesson introduction,
+since fpdf can't render anything else. Renderers are created once, as in
+the worker pool, so font loading isn't measured.
+"""
+
+import argparse
+import statistics
+import time
+from functools import partial
+from typing import Callable, Optional
+
+from app.core.settings import settings
+from app.services.pdf import FpdfRenderer, PdfRenderer, PyMuPdfRenderer
+
+_PARAGRAPH = (
+    "This week the class explored how weather changes across the seasons. "
+    "Students kept a daily log of temperature and rainfall, compared their "
+    "notes in small groups and presented what they found to the class."
+)
+SECTIONS = [
+    ("Overview", " ".join([_PARAGRAPH] * 2)),
+    ("Last Week's Activities", " ".join([_PARAGRAPH] * 4)),
+    ("Future Plans", " ".join([_PARAGRAPH] * 3)),
+    ("Announcements", _PARAGRAPH),
+]
+LESSON = "\n".join([_PARAGRAPH] * 12)
+
+
+def _measure(render: Callable[[], bytes], runs: int) -> tuple[float, int]:
+    render()  # warm up
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        data = render()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000, len(data)
+
+
+def _render(renderer: PdfRenderer, layout: str) -> bytes:
+    if layout == "newsletter":
+        return renderer.newsletter("Class 5A", SECTIONS)
+    return renderer.lesson_intro(LESSON)
+
+
+def _main(runs: int, font_path: Optional[str]) -> None:
+    renderers: list[PdfRenderer] = [FpdfRenderer(), PyMuPdfRenderer(font_path)]
+    print(f"runs: {runs}, font: {font_path or 'built-in'}")  # noqa: T201
+    for layout in ("newsletter", "lesson_intro"):
+        for renderer in renderers:
+            median, size = _measure(partial(_render, renderer, layout), runs)
+            print(  # noqa: T201
+                f"{layout:<13} {renderer.name:<8} {median:8.1f} ms",
+                f"{size / 1024:8.1f} KiB",
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--font", default=settings.pdf_font_path or None)
+    args = parser.parse_args()
+    _main(args.runs, args.font)
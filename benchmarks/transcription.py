@@ -0,0 +1,76 @@
+"""
+Compare single-pass and chunked parallel Whisper transcription.
+
+Usage::
+
+    python -m benchmarks.transcription path/to/lecture.mp3 --workers 4
+
+Both runs use the same number of CPU cores: the single pass gets one
+worker with all torch threads, the chunked run splits them across workers.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.settings import settings
+from app.services.transcription.audio import decode_to_pcm
+from app.services.transcription.pool import TranscriptionPool
+
+
+async def _measure(pool: TranscriptionPool, pcm_path: str) -> tuple[float, str]:
+    await pool.warm_up()
+    started = time.perf_counter()
+    transcription = await pool.transcribe(pcm_path)
+    return time.perf_counter() - started, transcription.text
+
+
+async def _main(args: argparse.Namespace) -> None:
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as workdir:
+        # Both paths read the same decoded samples, so decoding isn't measured.
+        pcm_path = str(Path(workdir) / "audio.pcm")
+        decode_to_pcm(args.audio, pcm_path)
+
+        single = TranscriptionPool(
+            workers=1,
+            queue_size=0,
+            timeout=24 * 3600,
+            model_size=args.model,
+            preload=True,
+            threads_per_worker=cpus,
+        )
+        single_time, single_text = await _measure(single, pcm_path)
+        single.shutdown()
+
+        chunked = TranscriptionPool(
+            workers=args.workers,
+            queue_size=0,
+            timeout=24 * 3600,
+            model_size=args.model,
+            preload=True,
+            chunk_seconds=args.chunk_seconds,
+            chunk_overlap=args.overlap,
+        )
+        chunked_time, chunked_text = await _measure(chunked, pcm_path)
+        chunked.shutdown()
+
+    single_words = len(single_text.split())
+    chunked_words = len(chunked_text.split())
+    print(f"model: {args.model}, cpus: {cpus}, workers: {args.workers}")  # noqa: T201
+    print(f"single pass: {single_time:8.1f}s {single_words} words")  # noqa: T201
+    print(f"chunked:     {chunked_time:8.1f}s {chunked_words} words")  # noqa: T201
+    print(f"speedup:     {single_time / chunked_time:8.2f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("audio", help="audio file to transcribe")
+    parser.add_argument("--model", default=settings.whisper_model)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-seconds", type=float, default=120)
+    parser.add_argument("--overlap", type=float, default=2.0)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,127 @@
+from pathlib import Path
+from typing import Any, ClassVar, Optional
+
+import pytest
+
+from app.repositories import youtube
+from app.services.transcription.audio import pcm_size
+from app.services.workspaces import WorkspaceQuotaError
+
+
+class _FakeYoutubeDL:
+    """Stands in for yt-dlp, "downloading" a file of a fixed size."""
+
+    duration = 10.0
+    # Duration reported by YouTube, None for a live recording.
+    reported_duration: Optional[float] = 10.0
+    download_bytes = 1000
+    downloads: ClassVar[list[Optional[int]]] = []
+
+    def __init__(self, params: dict[str, Any]) -> None:
+        self.params = params
+
+    def __enter__(self) -> "_FakeYoutubeDL":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+    def extract_info(self, url: str, download: bool) -> dict[str, Any]:
+        return {"duration": self.reported_duration, "ext": "webm"}
+
+    def process_ie_result(self, info: dict[str, Any], download: bool) -> dict[str, Any]:
+        _FakeYoutubeDL.downloads.append(self.params["max_filesize"])
+        Path(self.prepare_filename(info)).write_bytes(b"\0" * self.download_bytes)
+        return info
+
+    def prepare_filename(self, info: dict[str, Any]) -> str:
+        return self.params["outtmpl"] % {"ext": info["ext"]}
+
+
+@pytest.fixture
+def decoded(monkeypatch: pytest.MonkeyPatch) -> list[Optional[int]]:
+    """
+    Replace yt-dlp and ffmpeg with fakes.
+
+    The fake decoder writes the PCM size of the fake duration, cut at its limit.
+
+    :param monkeypatch: pytest monkeypatch.
+    :return: limits the decoder was called with.
+    """
+    limits: list[Optional[int]] = []
+
+    def decode_to_pcm(source: str, target: str, max_bytes: Optional[int]) -> None:
+        limits.append(max_bytes)
+        size = pcm_size(_FakeYoutubeDL.duration)
+        if max_bytes is not None:
+            size = min(size, max_bytes)
+        Path(target).write_bytes(b"\0" * size)
+
+    monkeypatch.setattr(_FakeYoutubeDL, "downloads", [])
+    monkeypatch.setattr(youtube.yt_dlp, "YoutubeDL", _FakeYoutubeDL)
+    monkeypatch.setattr(youtube, "decode_to_pcm", decode_to_pcm)
+    return limits
+
+
+def test_download_leaves_room_for_pcm(
+    decoded: list[Optional[int]],
+    tmp_path: Path,
+) -> None:
+    """
+    Tests that the download and the decoded audio share the quota.
+
+    :param decoded: limits the decoder was called with.
+    :param tmp_path: temporary directory.
+    """
+    pcm_bytes = pcm_size(_FakeYoutubeDL.duration)
+    quota = pcm_bytes + 5000
+
+    pcm_path = youtube.download_audio("https://youtu.be/abc", str(tmp_path), quota)
+
+    assert pcm_path == str(tmp_path / "audio.pcm")
+    assert Path(pcm_path).stat().st_size == pcm_bytes
+    assert _FakeYoutubeDL.downloads == [5000]
+    assert decoded == [quota - _FakeYoutubeDL.download_bytes]
+    assert not (tmp_path / "source.webm").exists()
+
+
+def test_audio_too_long_for_quota(
+    decoded: list[Optional[int]],
+    tmp_path: Path,
+) -> None:
+    """
+    Tests that audio that can't be decoded within the quota isn't downloaded.
+
+    :param decoded: limits the decoder was called with.
+    :param tmp_path: temporary directory.
+    """
+    quota = pcm_size(_FakeYoutubeDL.duration)
+
+    with pytest.raises(WorkspaceQuotaError):
+        youtube.download_audio("https://youtu.be/abc", str(tmp_path), quota)
+
+    assert _FakeYoutubeDL.downloads == []
+    assert decoded == []
+
+
+def test_decoding_stopped_at_quota(
+    decoded: list[Optional[int]],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """
+    Tests that audio without a duration fails at the quota instead of being cut.
+
+    :param decoded: limits the decoder was called with.
+    :param monkeypatch: pytest monkeypatch.
+    :param tmp_path: temporary directory.
+    """
+    quota = pcm_size(_FakeYoutubeDL.duration) + 5000
+    monkeypatch.setattr(_FakeYoutubeDL, "reported_duration", None)
+    monkeypatch.setattr(_FakeYoutubeDL, "duration", 20.0)
+
+    with pytest.raises(WorkspaceQuotaError):
+        youtube.download_audio("https://youtu.be/abc", str(tmp_path), quota)
+
+    assert _FakeYoutubeDL.downloads == [quota]
+    assert decoded == [quota - _FakeYoutubeDL.download_bytes]
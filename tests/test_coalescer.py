@@ -0,0 +1,102 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.services.coalescing import Coalescer
+
+
+@pytest.mark.anyio
+async def test_duplicates_share_one_computation() -> None:
+    """Tests that identical requests in flight are computed once."""
+    coalescer = Coalescer()
+    calls = 0
+
+    async def compute() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "summary"
+
+    results = await asyncio.gather(
+        *(coalescer.run(("video", "abc", "en"), compute) for _ in range(5)),
+        coalescer.run(("video", "abc", "fr"), compute),
+    )
+
+    assert results == ["summary"] * 6
+    assert calls == 2
+    stats = coalescer.stats()
+    assert stats["requests"] == 6
+    assert stats["coalesced"] == 4
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.anyio
+async def test_errors_are_shared_and_not_kept() -> None:
+    """Tests that every waiter gets the error, and the next request tries again."""
+    coalescer = Coalescer()
+
+    async def fail() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError("quota")
+
+    results = await asyncio.gather(
+        *(coalescer.run("key", fail) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+    async def succeed() -> str:
+        return "ok"
+
+    assert await coalescer.run("key", succeed) == "ok"
+
+
+@pytest.mark.anyio
+async def test_computation_stops_without_waiters() -> None:
+    """Tests that a computation is cancelled once every caller has gone away."""
+    coalescer = Coalescer()
+    cancelled = asyncio.Event()
+
+    async def compute() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiters = [asyncio.ensure_future(coalescer.run("key", compute)) for _ in range(2)]
+    await asyncio.sleep(0)
+    waiters[0].cancel()
+    await asyncio.sleep(0)
+    assert not cancelled.is_set()
+    waiters[1].cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert coalescer.stats()["in_flight"] == 0
+
+
+@pytest.mark.anyio
+async def test_workers_take_turns(tmp_path: Path) -> None:
+    """
+    Tests that coalescers sharing a lock directory compute a key one at a time.
+
+    :param tmp_path: directory for the lock files.
+    """
+    workers = [Coalescer(lock_dir=tmp_path), Coalescer(lock_dir=tmp_path)]
+    running = 0
+    overlapped = False
+
+    async def compute() -> str:
+        nonlocal running, overlapped
+        running += 1
+        overlapped = overlapped or running > 1
+        await asyncio.sleep(0.05)
+        running -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(worker.run("key", compute) for worker in workers))
+
+    assert results == ["ok", "ok"]
+    assert not overlapped
+    assert sum(worker.stats()["lock_waits"] for worker in workers) == 1
+    assert list(tmp_path.iterdir()) == []
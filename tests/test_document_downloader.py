@@ -0,0 +1,115 @@
+import io
+
+import httpx
+import pytest
+
+from app.services.documents import (
+    DocumentDownloader,
+    DocumentDownloadError,
+    DocumentTooLargeError,
+    resolve_document_url,
+)
+
+
+def test_drive_links_are_resolved() -> None:
+    """Tests that Drive and Docs links lead to their download endpoints."""
+    file_id = "1AbCdEfGhIjKlMnOp"
+    key, url = resolve_document_url(
+        f"https://drive.google.com/file/d/{file_id}/view?usp=sharing",
+    )
+    assert key == f"drive:{file_id}"
+    assert url.startswith(
+        "https://drive.usercontent.google.com/download?id=1AbCdEfGhIjKlMnOp",
+    )
+    assert resolve_document_url(f"https://drive.google.com/open?id={file_id}")[0] == key
+    key, url = resolve_document_url(
+        f"https://docs.google.com/document/d/{file_id}/edit",
+    )
+    assert url == f"https://docs.google.com/document/d/{file_id}/export?format=docx"
+    assert resolve_document_url("https://example.com/plan.docx") == (
+        "https://example.com/plan.docx",
+        "https://example.com/plan.docx",
+    )
+
+
+@pytest.mark.anyio
+async def test_unchanged_documents_are_revalidated() -> None:
+    """Tests that a document downloaded before only costs a 304."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=b"docx", headers={"etag": '"v1"'})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    downloader = DocumentDownloader(
+        client,
+        max_bytes=1024,
+        cache_bytes=1024,
+        spill_bytes=512,
+    )
+    for _ in range(2):
+        with await downloader.fetch("https://example.com/plan.docx") as document:
+            assert document.read() == b"docx"
+    await client.aclose()
+
+    assert "if-none-match" not in requests[0].headers
+    assert requests[1].headers["if-none-match"] == '"v1"'
+    stats = downloader.stats()
+    assert stats["downloads"] == 1
+    assert stats["revalidations"] == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("response", "error"),
+    [
+        (httpx.Response(200, content=b"x" * 2048), DocumentTooLargeError),
+        (httpx.Response(200, html="<html>Sign in</html>"), DocumentDownloadError),
+        (httpx.Response(404), DocumentDownloadError),
+    ],
+)
+async def test_bad_downloads_are_rejected(
+    response: httpx.Response,
+    error: type[Exception],
+) -> None:
+    """
+    Tests the size limit and errors for links that don't lead to a file.
+
+    :param response: response of the document server.
+    :param error: expected error.
+    """
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda _: response))
+    downloader = DocumentDownloader(
+        client,
+        max_bytes=1024,
+        cache_bytes=1024,
+        spill_bytes=512,
+    )
+    with pytest.raises(error):
+        await downloader.fetch("https://example.com/plan.docx")
+    await client.aclose()
+
+
+@pytest.mark.anyio
+async def test_large_documents_spill_to_disk() -> None:
+    """Tests that documents over the spill size leave memory, and aren't cached."""
+    content = b"x" * 768
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda _: httpx.Response(200, content=content, headers={"etag": '"v1"'}),
+        ),
+    )
+    downloader = DocumentDownloader(
+        client,
+        max_bytes=1024,
+        cache_bytes=1024,
+        spill_bytes=512,
+    )
+    with await downloader.fetch("https://example.com/plan.docx") as document:
+        assert not isinstance(document, io.BytesIO)
+        assert document.read() == content
+    await client.aclose()
+    assert downloader.stats()["cached_documents"] == 0
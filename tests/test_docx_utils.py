@@ -0,0 +1,48 @@
+import io
+
+import pytest
+from docx import Document
+
+from app.utils.docx_utils import DocxError, extract_table_fields, iter_paragraphs
+
+
+def _docx() -> io.BytesIO:
+    document = Document()
+    document.add_paragraph("Intro")
+    document.add_paragraph("")
+    table = document.add_table(rows=3, cols=3)
+    table.cell(0, 0).text = "Name of the Class"
+    table.cell(0, 1).text = "5A"
+    table.cell(1, 0).merge(table.cell(1, 1)).text = "Wide"
+    table.cell(1, 2).merge(table.cell(2, 2)).text = "Tall"
+    table.cell(2, 0).text = "Special Announcement"
+    table.cell(2, 1).text = "Trip\nFriday"
+    document.add_paragraph("Closing")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_docx_matches_python_docx() -> None:
+    """Tests that streaming gives the same text as python-docx."""
+    data = _docx().getvalue()
+    document = Document(io.BytesIO(data))
+    assert list(iter_paragraphs(io.BytesIO(data))) == [
+        paragraph.text for paragraph in document.paragraphs
+    ]
+    fields = extract_table_fields(
+        io.BytesIO(data),
+        ["Name of the Class", "Wide", "Special Announcement", "Missing"],
+    )
+    assert fields == {
+        "Name of the Class": "5A",
+        "Wide": "Wide",
+        "Special Announcement": "Trip\nFriday",
+    }
+
+
+def test_docx_rejects_other_files() -> None:
+    """Tests that files other than .docx documents are rejected."""
+    with pytest.raises(DocxError):
+        list(iter_paragraphs(io.BytesIO(b"not a zip")))
@@ -0,0 +1,172 @@
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, ClassVar, Optional
+
+import google.ai.generativelanguage as glm
+import pytest
+
+from app.services.gemini import client as gemini_client
+from app.services.gemini.cache import LLMCache
+from app.services.gemini.client import GeminiClient
+
+
+class _FakeModel:
+    """Stands in for ``genai.GenerativeModel``, counting the models created."""
+
+    created: ClassVar[list["_FakeModel"]] = []
+
+    reply = "reply to {prompt}"
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = f"models/{model_name}"
+        self.calls = 0
+        _FakeModel.created.append(self)
+
+    async def generate_content_async(
+        self,
+        prompt: str,
+        generation_config: Optional[dict[str, Any]] = None,
+        stream: bool = False,
+    ) -> Any:
+        self.calls += 1
+        await asyncio.sleep(0)
+        text = self.reply.format(prompt=prompt)
+        if stream:
+            return _FakeStream(text)
+        return SimpleNamespace(text=text, usage_metadata=None)
+
+
+class _FakeStream:
+    """Streams a reply in two chunks, then a chunk with only a finish reason."""
+
+    usage_metadata = None
+
+    def __init__(self, text: str) -> None:
+        middle = len(text) // 2
+        self.candidates = [
+            glm.Candidate(content=glm.Content(parts=[glm.Part(text=piece)]))
+            for piece in (text[:middle], text[middle:])
+        ]
+        self.candidates.append(glm.Candidate(finish_reason="STOP"))
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        for candidate in self.candidates:
+            yield _FakeChunk(candidate)
+
+
+class _FakeChunk:
+    """Chunk of a streamed response, with the library's ``text`` accessor."""
+
+    def __init__(self, candidate: glm.Candidate) -> None:
+        self.candidates = [candidate]
+
+    @property
+    def text(self) -> str:
+        parts = self.candidates[0].content.parts
+        if not parts:
+            raise ValueError("The response.text quick accessor requires a Part.")
+        return str(parts[0].text)
+
+
+@pytest.fixture
+def fake_models(monkeypatch: pytest.MonkeyPatch) -> list[_FakeModel]:
+    """
+    Replace the Gemini models with fakes.
+
+    :param monkeypatch: pytest monkeypatch.
+    :return: models created during the test.
+    """
+    monkeypatch.setattr(_FakeModel, "created", [])
+    monkeypatch.setattr(gemini_client.genai, "GenerativeModel", _FakeModel)
+    return _FakeModel.created
+
+
+@pytest.mark.anyio
+async def test_model_is_reused_across_calls(fake_models: list[_FakeModel]) -> None:
+    """
+    Tests that concurrent and later calls all go through one model object.
+
+    :param fake_models: models created during the test.
+    """
+    gemini = GeminiClient("gemini-test")
+
+    replies = await asyncio.gather(*(gemini.generate(f"p{i}") for i in range(5)))
+    replies.append(await gemini.generate("last"))
+
+    assert replies[-1] == "reply to last"
+    assert len(fake_models) == 1
+    assert fake_models[0].calls == 6
+    model: Any = gemini.get_model()
+    assert model is fake_models[0]
+
+
+@pytest.mark.anyio
+async def test_one_model_per_name(fake_models: list[_FakeModel]) -> None:
+    """
+    Tests that every model name gets its own cached model object.
+
+    :param fake_models: models created during the test.
+    """
+    gemini = GeminiClient("gemini-test")
+
+    await gemini.generate("a")
+    await gemini.generate("b", model_name="gemini-other")
+    await gemini.generate("c", model_name="gemini-other")
+
+    assert [model.model_name for model in fake_models] == [
+        "models/gemini-test",
+        "models/gemini-other",
+    ]
+    assert [model.calls for model in fake_models] == [1, 2]
+
+
+@pytest.mark.anyio
+async def test_only_valid_responses_are_cached(
+    fake_models: list[_FakeModel],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """
+    Tests that a response rejected by its check is never cached.
+
+    :param fake_models: models created during the test.
+    :param monkeypatch: pytest monkeypatch.
+    :param tmp_path: temporary directory.
+    """
+    cache = LLMCache(
+        path=tmp_path / "llm_cache.sqlite3",
+        memory_items=8,
+        memory_ttl=60,
+        disk_ttl=60,
+        disk_max_bytes=1024 * 1024,
+    )
+    gemini = GeminiClient("gemini-test", cache=cache)
+
+    monkeypatch.setattr(_FakeModel, "reply", "not json")
+    for _ in range(2):
+        with pytest.raises(json.JSONDecodeError):
+            await gemini.generate("p", validate=json.loads)
+
+    monkeypatch.setattr(_FakeModel, "reply", "{{}}")
+    assert await gemini.generate("p", validate=json.loads) == "{}"
+    assert await gemini.generate("p", validate=json.loads) == "{}"
+    assert fake_models[0].calls == 3
+    cache.close()
+
+
+@pytest.mark.anyio
+async def test_stream_skips_chunks_without_text(
+    fake_models: list[_FakeModel],
+) -> None:
+    """
+    Tests that a chunk with only a finish reason ends the stream quietly.
+
+    :param fake_models: models created during the test.
+    """
+    gemini = GeminiClient("gemini-test")
+
+    pieces = [piece async for piece in gemini.generate_stream("p")]
+
+    assert pieces == ["reply", " to p"]
@@ -0,0 +1,133 @@
+import time
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from app.services.gemini import GeminiLimiter, GeminiQuotaError
+from app.services.gemini.limiter import (
+    AimdController,
+    GeminiKey,
+    TokenBucket,
+    retry_after,
+)
+
+
+def _limiter(**kwargs: object) -> GeminiLimiter:
+    options = {
+        "keys": ["key-a"],
+        "rpm": 0,
+        "tpm": 0,
+        "min_concurrency": 1,
+        "max_concurrency": 8,
+        "max_retries": 3,
+        "backoff_base": 0.01,
+        "backoff_max": 1,
+        **kwargs,
+    }
+    return GeminiLimiter(**options)  # type: ignore[arg-type]
+
+
+@pytest.mark.anyio
+async def test_bucket_waits_for_tokens() -> None:
+    """Tests that a bucket lets a minute's worth through, then paces calls."""
+    bucket = TokenBucket(per_minute=600)
+    assert await bucket.acquire(600) == 0
+    started = time.monotonic()
+    await bucket.acquire(2)
+    assert time.monotonic() - started >= 0.15
+
+
+@pytest.mark.anyio
+async def test_throttled_calls_are_retried() -> None:
+    """Tests that a throttled call is retried after the hinted delay."""
+    limiter = _limiter()
+    attempts = 0
+
+    async def call(_: GeminiKey) -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise google_exceptions.ResourceExhausted("Quota exceeded, retry in 0.05s")
+        return "ok"
+
+    started = time.monotonic()
+    assert await limiter.call(call, tokens=10) == "ok"
+    assert time.monotonic() - started >= 0.05
+    stats = limiter.stats()
+    assert stats["throttled"] == 1
+    assert stats["retries"] == 1
+    assert stats["keys"][0]["concurrency_limit"] == 4
+
+
+@pytest.mark.anyio
+async def test_quota_error_after_retries() -> None:
+    """Tests that a call throttled on every attempt fails with the API's hint."""
+    limiter = _limiter(max_retries=2)
+
+    async def call(_: GeminiKey) -> None:
+        raise google_exceptions.TooManyRequests("Quota exceeded, retry in 0.01s")
+
+    with pytest.raises(GeminiQuotaError) as error:
+        await limiter.call(call, tokens=10)
+    # The hint, plus up to backoff_base of jitter.
+    assert error.value.retry_after is not None
+    assert 0 < error.value.retry_after <= 0.02
+    assert limiter.stats()["retries"] == 2
+    assert limiter.stats()["quota_errors"] == 1
+
+
+@pytest.mark.anyio
+async def test_other_errors_are_not_retried() -> None:
+    """Tests that errors other than throttling fail the call right away."""
+    limiter = _limiter()
+
+    async def call(_: GeminiKey) -> None:
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        await limiter.call(call, tokens=10)
+    assert limiter.stats()["retries"] == 0
+    assert limiter.stats()["keys"][0]["in_flight"] == 0
+
+
+@pytest.mark.anyio
+async def test_throttled_keys_cool_down() -> None:
+    """Tests that calls go to the key with the most quota left, not throttled ones."""
+    limiter = _limiter(keys=["key-a", "key-b"], rpm=60)
+    used = []
+
+    async def call(key: GeminiKey) -> str:
+        used.append(key.api_key)
+        if key.api_key == "key-a":
+            raise google_exceptions.ResourceExhausted("Quota exceeded, retry in 30s")
+        return "ok"
+
+    started = time.monotonic()
+    for _ in range(3):
+        assert await limiter.call(call, tokens=10) == "ok"
+    # key-a is tried once, then left alone while it cools down.
+    assert used == ["key-a", "key-b", "key-b", "key-b"]
+    assert time.monotonic() - started < 1
+    assert [key["cooling_down"] for key in limiter.stats()["keys"]] == [True, False]
+
+
+@pytest.mark.anyio
+async def test_aimd_halves_once_per_burst() -> None:
+    """Tests that a throttled burst halves the limit once, and successes grow it."""
+    controller = AimdController(minimum=1, maximum=8)
+    slots = [await controller.acquire() for _ in range(4)]
+    for started in slots:
+        controller.release(started, throttled=True)
+    assert controller.limit == 4
+    for _ in range(8):
+        controller.release(await controller.acquire(), throttled=False)
+    assert 5 < controller.limit < 7
+
+
+def test_retry_hint_from_message() -> None:
+    """Tests that the retry delay is read from the error of the REST API."""
+    error = google_exceptions.ResourceExhausted(
+        "429 Quota exceeded. retry_delay { seconds: 29 }",
+    )
+    assert retry_after(error) == 29
+    assert retry_after(google_exceptions.ResourceExhausted("Quota exceeded")) is None
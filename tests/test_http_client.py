@@ -0,0 +1,32 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.http import HostLimitedTransport
+
+
+@pytest.mark.anyio
+async def test_requests_are_limited_per_host() -> None:
+    """Tests that a host can't take more than its share of connections."""
+    in_flight: dict[str, int] = {"a": 0, "b": 0}
+    peak: dict[str, int] = {"a": 0, "b": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        in_flight[host] += 1
+        peak[host] = max(peak[host], in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return httpx.Response(200, content=b"ok")
+
+    transport = HostLimitedTransport(httpx.MockTransport(handler), max_per_host=2)
+    async with httpx.AsyncClient(transport=transport) as client:
+        responses = await asyncio.gather(
+            *(client.get(f"http://{host}/") for host in "ab" * 4),
+        )
+
+    assert all(response.text == "ok" for response in responses)
+    assert peak == {"a": 2, "b": 2}
+    # Slots of idle hosts are dropped, so arbitrary links don't pile up.
+    assert not transport._hosts  # noqa: SLF001
@@ -0,0 +1,147 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.jobs import JobManager, JobQueueFullError, JobStatus, manager
+
+
+async def _wait_for(jobs: JobManager, job_id: str) -> dict:
+    for _ in range(100):
+        job = await jobs.get(job_id)
+        if job["status"] not in {JobStatus.PENDING, JobStatus.RUNNING}:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("Job did not finish.")
+
+
+@pytest.mark.anyio
+async def test_job_results_and_errors(tmp_path: Path) -> None:
+    """
+    Tests that results and HTTP errors of jobs are stored.
+
+    :param tmp_path: temporary directory for the job store.
+    """
+    jobs = JobManager(tmp_path / "jobs.sqlite3", workers=2, queue_size=4, result_ttl=60)
+    jobs.start()
+
+    async def succeed() -> dict:
+        return {"summary": "text"}
+
+    async def fail() -> dict:
+        raise HTTPException(status_code=400, detail="Invalid URL.")
+
+    try:
+        done = await _wait_for(jobs, await jobs.submit("summary", succeed))
+        failed = await _wait_for(jobs, await jobs.submit("summary", fail))
+        assert await jobs.get("unknown") is None
+    finally:
+        await jobs.shutdown()
+
+    assert done["status"] == JobStatus.SUCCEEDED
+    assert done["result"] == {"summary": "text"}
+    assert failed["status"] == JobStatus.FAILED
+    assert failed["error"] == {"status_code": 400, "detail": "Invalid URL."}
+
+
+@pytest.mark.anyio
+async def test_running_job_outlives_ttl(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """
+    Tests that a job running longer than the TTL keeps its row and its result.
+
+    :param monkeypatch: pytest monkeypatch.
+    :param tmp_path: temporary directory for the job store.
+    """
+    clock = [1000.0]
+    monkeypatch.setattr(manager.time, "time", lambda: clock[0])
+    jobs = JobManager(tmp_path / "jobs.sqlite3", workers=2, queue_size=4, result_ttl=60)
+    jobs.start()
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow() -> dict:
+        started.set()
+        await release.wait()
+        return {"summary": "text"}
+
+    async def succeed() -> dict:
+        return {"summary": "other"}
+
+    try:
+        job_id = await jobs.submit("summary", slow)
+        await started.wait()
+        clock[0] += 120
+        running = await jobs.get(job_id)
+        # Submitting drops the expired jobs, the running one must stay.
+        await _wait_for(jobs, await jobs.submit("summary", succeed))
+        release.set()
+        done = await _wait_for(jobs, job_id)
+        clock[0] += 120
+        expired = await jobs.get(job_id)
+    finally:
+        await jobs.shutdown()
+
+    assert running["status"] == JobStatus.RUNNING
+    assert done["status"] == JobStatus.SUCCEEDED
+    assert done["result"] == {"summary": "text"}
+    assert expired is None
+
+
+@pytest.mark.anyio
+async def test_full_queue_is_rejected(tmp_path: Path) -> None:
+    """
+    Tests that jobs beyond the queue size are rejected.
+
+    :param tmp_path: temporary directory for the job store.
+    """
+    jobs = JobManager(tmp_path / "jobs.sqlite3", workers=1, queue_size=1, result_ttl=60)
+
+    async def noop() -> None:
+        """Never runs, the workers aren't started."""
+
+    try:
+        await jobs.submit("noop", noop)
+        with pytest.raises(JobQueueFullError):
+            await jobs.submit("noop", noop)
+    finally:
+        await jobs.shutdown()
+
+
+@pytest.mark.anyio
+async def test_unfinished_jobs_fail_on_shutdown(tmp_path: Path) -> None:
+    """
+    Tests that running and queued jobs are marked failed when the executor stops.
+
+    :param tmp_path: temporary directory for the job store.
+    """
+    path = tmp_path / "jobs.sqlite3"
+    jobs = JobManager(path, workers=1, queue_size=2, result_ttl=60)
+    jobs.start()
+    started = asyncio.Event()
+
+    async def hang() -> None:
+        started.set()
+        await asyncio.Event().wait()
+
+    async def succeed() -> dict:
+        return {"summary": "text"}
+
+    done = await _wait_for(jobs, await jobs.submit("summary", succeed))
+    running = await jobs.submit("summary", hang)
+    queued = await jobs.submit("summary", succeed)
+    await started.wait()
+    await jobs.shutdown()
+
+    reopened = JobManager(path, workers=1, queue_size=2, result_ttl=60)
+    try:
+        assert (await reopened.get(done["job_id"]))["status"] == JobStatus.SUCCEEDED
+        for job_id in (running, queued):
+            job = await reopened.get(job_id)
+            assert job["status"] == JobStatus.FAILED
+            assert job["error"]["status_code"] == 503
+    finally:
+        await reopened.shutdown()
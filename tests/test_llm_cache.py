@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+
+from app.services.gemini.cache import LLMCache
+
+
+def _make_cache(path: Path, memory_items: int = 8) -> LLMCache:
+    return LLMCache(
+        path=path / "llm_cache.sqlite3",
+        memory_items=memory_items,
+        memory_ttl=60,
+        disk_ttl=60,
+        disk_max_bytes=1024 * 1024,
+    )
+
+
+def test_key_depends_on_all_inputs() -> None:
+    """Tests that model, prompt and config all change the key."""
+    key = LLMCache.make_key("model", "prompt", {"temperature": 0})
+    assert key == LLMCache.make_key("model", "prompt", {"temperature": 0})
+    assert key != LLMCache.make_key("other", "prompt", {"temperature": 0})
+    assert key != LLMCache.make_key("model", "other", {"temperature": 0})
+    assert key != LLMCache.make_key("model", "prompt", {"temperature": 1})
+
+
+@pytest.mark.anyio
+async def test_memory_and_disk_tiers(tmp_path: Path) -> None:
+    """
+    Tests that responses are served from memory, then from disk.
+
+    :param tmp_path: temporary directory for the disk tier.
+    """
+    cache = _make_cache(tmp_path)
+    assert await cache.get("key") is None
+    await cache.set("key", "value")
+    assert await cache.get("key") == "value"
+    cache.close()
+
+    # A fresh instance shares only the disk tier, like another worker would.
+    other = _make_cache(tmp_path)
+    assert await other.get("key") == "value"
+    assert await other.get("key") == "value"
+    assert other.stats()["disk_hits"] == 1
+    assert other.stats()["memory_hits"] == 1
+    other.close()
+
+
+@pytest.mark.anyio
+async def test_memory_tier_is_bounded(tmp_path: Path) -> None:
+    """
+    Tests that the memory tier evicts least recently used entries.
+
+    :param tmp_path: temporary directory for the disk tier.
+    """
+    cache = _make_cache(tmp_path, memory_items=2)
+    await cache.set("a", "1")
+    await cache.set("b", "2")
+    await cache.get("a")
+    await cache.set("c", "3")
+    assert cache.stats()["memory_items"] == 2
+    assert cache._memory_get("b") is None  # noqa: SLF001
+    assert cache._memory_get("a") == "1"  # noqa: SLF001
+    cache.close()
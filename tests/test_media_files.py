@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.services.media import MediaFiles
+from app.utils.media_utils import media_name
+
+
+@pytest.fixture
+def media(tmp_path: Path) -> tuple[TestClient, str]:
+    """
+    Serves a temporary media directory with one generated file.
+
+    :param tmp_path: temporary media directory.
+    :return: client and the file's name.
+    """
+    name = media_name("lesson", "intro", ".pdf")
+    (tmp_path / name).write_bytes(b"0123456789")
+    app = Starlette(routes=[Mount("/media", MediaFiles(directory=tmp_path))])
+    return TestClient(app), name
+
+
+def test_generated_files_are_immutable(media: tuple[TestClient, str]) -> None:
+    """
+    Tests caching headers and conditional requests.
+
+    :param media: client and file name.
+    """
+    client, name = media
+    response = client.get(f"/media/{name}")
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
+    assert response.headers["etag"] == f'"{name[7:39]}"'
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["accept-ranges"] == "bytes"
+
+    response = client.get(
+        f"/media/{name}",
+        headers={"if-none-match": response.headers["etag"]},
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.parametrize(
+    ("range_header", "status", "body", "content_range"),
+    [
+        ("bytes=2-5", 206, b"2345", "bytes 2-5/10"),
+        ("bytes=7-", 206, b"789", "bytes 7-9/10"),
+        ("bytes=-3", 206, b"789", "bytes 7-9/10"),
+        ("bytes=5-100", 206, b"56789", "bytes 5-9/10"),
+        ("bytes=0-1,4-5", 200, b"0123456789", None),
+        ("bytes=10-", 416, b"", "bytes */10"),
+    ],
+)
+def test_byte_ranges(
+    media: tuple[TestClient, str],
+    range_header: str,
+    status: int,
+    body: bytes,
+    content_range: str,
+) -> None:
+    """
+    Tests single byte ranges, ignored multiple ranges and unsatisfiable ones.
+
+    :param media: client and file name.
+    :param range_header: requested range.
+    :param status: expected status.
+    :param body: expected body.
+    :param content_range: expected Content-Range header.
+    """
+    client, name = media
+    response = client.get(f"/media/{name}", headers={"range": range_header})
+    assert response.status_code == status
+    assert response.content == body
+    assert response.headers.get("content-range") == content_range
+    if status != 416:
+        assert response.headers["content-length"] == str(len(body))
+
+
+def test_outdated_if_range_gets_whole_file(media: tuple[TestClient, str]) -> None:
+    """
+    Tests that a range is ignored when the client's copy is outdated.
+
+    :param media: client and file name.
+    """
+    client, name = media
+    response = client.get(
+        f"/media/{name}",
+        headers={"range": "bytes=2-5", "if-range": '"outdated"'},
+    )
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
@@ -0,0 +1,56 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.media import MediaStore
+
+
+@pytest.mark.anyio
+async def test_persisted_media_is_reused(tmp_path: Path) -> None:
+    """
+    Tests that a file saved before isn't rendered again.
+
+    :param tmp_path: temporary media directory.
+    """
+    store = MediaStore(tmp_path, ttl=60, max_bytes=1024, sweep_interval=60)
+    renders = []
+
+    async def render() -> bytes:
+        renders.append(1)
+        return b"%PDF"
+
+    first = await store.persist("lesson-abc.pdf", render)
+    second = await store.persist("lesson-abc.pdf", render)
+    assert first == second == tmp_path / "lesson-abc.pdf"
+    assert first.read_bytes() == b"%PDF"
+    assert len(renders) == 1
+    assert store.stats()["bytes_stored"] == 4
+
+
+def test_sweep_expires_and_evicts(tmp_path: Path) -> None:
+    """
+    Tests that old files expire and the least recently used go over the size limit.
+
+    :param tmp_path: temporary media directory.
+    """
+    store = MediaStore(tmp_path, ttl=3600, max_bytes=250, sweep_interval=60)
+    now = time.time()
+    for name, age in [("expired", 7200), ("old", 300), ("used", 200), ("new", 100)]:
+        path = tmp_path / f"{name}.pdf"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (now - age, now - age))
+    (tmp_path / ".interrupted.tmp").write_bytes(b"x")
+    os.utime(tmp_path / ".interrupted.tmp", (now - 7200, now - 7200))
+    store.touch("old.pdf")
+
+    store.sweep()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["new.pdf", "old.pdf"]
+    assert store.stats() == {
+        "bytes_stored": 200,
+        "files": 2,
+        "files_expired": 1,
+        "files_evicted": 1,
+    }
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pytest
+
+from app.utils.media_utils import atomic_output, media_name
+
+
+def test_media_name_depends_on_inputs() -> None:
+    """Tests that artifacts are named after their kind and inputs."""
+    name = media_name("lesson", {"text": "intro"}, ".pdf")
+    assert name == media_name("lesson", {"text": "intro"}, ".pdf")
+    assert name.startswith("lesson-") and name.endswith(".pdf")
+    assert name != media_name("lesson", {"text": "other"}, ".pdf")
+    assert name != media_name("newsletter", {"text": "intro"}, ".pdf")
+
+
+def test_atomic_output(tmp_path: Path) -> None:
+    """
+    Tests that the target only appears once fully written.
+
+    :param tmp_path: temporary directory for the files.
+    """
+    target = tmp_path / "file.pdf"
+    with pytest.raises(RuntimeError), atomic_output(target) as temp_path:
+        Path(temp_path).write_bytes(b"partial")
+        raise RuntimeError
+    assert list(tmp_path.iterdir()) == []
+
+    with atomic_output(target) as temp_path:
+        Path(temp_path).write_bytes(b"data")
+        assert not target.exists()
+    assert target.read_bytes() == b"data"
+    assert list(tmp_path.iterdir()) == [target]
@@ -0,0 +1,137 @@
+import asyncio
+import json
+from typing import Any, Optional
+
+import pytest
+
+from app.core.settings import NewsletterMode, settings
+from app.repositories.generate_text import (
+    generate_newsletter_content,
+    generate_newsletter_sections,
+)
+from app.services.gemini import GeminiQuotaError
+
+
+class _FakeGemini:
+    """Stands in for the Gemini client, failing the prompts that contain a marker."""
+
+    def __init__(
+        self,
+        fail_on: str = "",
+        error: Optional[Exception] = None,
+        json_reply: str = "",
+    ) -> None:
+        self.fail_on = fail_on
+        self.error = error or RuntimeError("boom")
+        self.json_reply = json_reply
+        self.json_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt: str, **kwargs: Any) -> str:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail_on and self.fail_on in prompt:
+                raise self.error
+            if kwargs.get("generation_config"):
+                self.json_calls += 1
+                return self.json_reply
+            return "**Narrative**  text"
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.anyio
+async def test_sections_run_concurrently() -> None:
+    """Tests that the overview and the three sections are generated at once."""
+    gemini = _FakeGemini()
+
+    sections = await generate_newsletter_sections(gemini, "past1", "next1", "news1")
+
+    assert sections == ("Narrative text",) * 4
+    assert gemini.max_in_flight == 4
+
+
+@pytest.mark.anyio
+async def test_failed_section_falls_back_alone() -> None:
+    """Tests that a failed section gets its fallback and the others are kept."""
+    gemini = _FakeGemini(fail_on="next1")
+
+    overview, past, future, announcement = await generate_newsletter_sections(
+        gemini,
+        "past1",
+        "next1",
+        "news1",
+    )
+
+    assert past == "Narrative text"
+    assert future == "Error extracting activities."
+    assert announcement == "Narrative text"
+    # The overview is built from every section, so it fails with the bad one.
+    assert overview == "Error generating overview."
+
+
+@pytest.mark.anyio
+async def test_quota_error_fails_the_newsletter() -> None:
+    """Tests that running out of quota isn't hidden behind a fallback."""
+    gemini = _FakeGemini(fail_on="news1", error=GeminiQuotaError("over quota"))
+
+    with pytest.raises(GeminiQuotaError):
+        await generate_newsletter_sections(gemini, "past1", "next1", "news1")
+
+
+@pytest.mark.anyio
+async def test_structured_mode_uses_one_call(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that a valid JSON response fills the whole newsletter.
+
+    :param monkeypatch: pytest monkeypatch.
+    """
+    monkeypatch.setattr(settings, "newsletter_mode", NewsletterMode.STRUCTURED)
+    reply = {
+        "overview": "A **busy** week.",
+        "past": "We  painted.",
+        "future": "We will sing.",
+        "announcement": "No school on Friday.",
+    }
+    gemini = _FakeGemini(json_reply=json.dumps(reply))
+
+    content = await generate_newsletter_content(gemini, "past1", "next1", "news1")
+
+    assert content == (
+        "A busy week.",
+        "We painted.",
+        "We will sing.",
+        "No school on Friday.",
+    )
+    assert gemini.json_calls == 1
+    assert gemini.max_in_flight == 1
+
+
+@pytest.mark.parametrize(
+    "json_reply",
+    ["not json", json.dumps({"overview": "Missing the sections."})],
+)
+@pytest.mark.anyio
+async def test_structured_mode_falls_back(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+    json_reply: str,
+) -> None:
+    """
+    Tests that an unusable JSON response falls back to the per-section calls.
+
+    :param monkeypatch: pytest monkeypatch.
+    :param caplog: pytest log capture.
+    :param json_reply: unusable response of the JSON-mode call.
+    """
+    monkeypatch.setattr(settings, "newsletter_mode", NewsletterMode.STRUCTURED)
+    gemini = _FakeGemini(json_reply=json_reply)
+
+    content = await generate_newsletter_content(gemini, "past1", "next1", "news1")
+
+    assert content == ("Narrative text",) * 4
+    assert gemini.json_calls == 1
+    assert "falling back" in caplog.text
@@ -0,0 +1,49 @@
+import fitz
+import pytest
+
+from app.core.settings import PdfBackend
+from app.services.pdf import FpdfRenderer, PdfRenderPool, PyMuPdfRenderer
+
+SECTIONS = [
+    ("Overview", "Tuần này lớp đã học về “thời tiết” — 天气 и погода."),
+    ("Announcements", "Field trip on Friday.\nBring a hat."),
+]
+
+
+def _text(data: bytes) -> str:
+    with fitz.open("pdf", data) as document:
+        return "".join(page.get_text() for page in document)
+
+
+def test_pymupdf_renders_unicode() -> None:
+    """Tests that non-Latin text reaches the PDF unchanged."""
+    text = _text(PyMuPdfRenderer().newsletter("Lớp 5A", SECTIONS))
+    assert "Lớp 5A: Weekly Class Newsletter" in text
+    assert "“thời tiết” — 天气 и погода." in text
+    assert "Bring a hat." in text
+
+
+def test_pymupdf_lesson_pages_are_numbered() -> None:
+    """Tests that long lesson introductions flow over numbered pages."""
+    data = PyMuPdfRenderer().lesson_intro("\n".join(["A hook sentence."] * 80))
+    with fitz.open("pdf", data) as document:
+        assert document.page_count > 1
+        for number, page in enumerate(document, start=1):
+            text = page.get_text()
+            assert "Lesson Introduction" in text
+            assert f"Page {number}" in text
+
+
+def test_fpdf_replaces_unsupported_characters() -> None:
+    """Tests that the fpdf backend doesn't fail on text outside Latin-1."""
+    text = _text(FpdfRenderer().newsletter("Lớp 5A", SECTIONS))
+    assert "Field trip on Friday." in text
+
+
+@pytest.mark.anyio
+async def test_pool_renders_in_thread() -> None:
+    """Tests rendering through the pool without worker processes."""
+    pool = PdfRenderPool(PdfBackend.PYMUPDF, workers=0)
+    data = await pool.lesson_intro("Hook.")
+    pool.shutdown()
+    assert data.startswith(b"%PDF")
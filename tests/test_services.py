@@ -0,0 +1,133 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.settings import settings
+from app.services.coalescing import get_coalescer
+from app.services.coalescing.lifespan import init_coalescer
+from app.services.documents import get_document_downloader
+from app.services.documents.lifespan import init_documents
+from app.services.gemini import get_gemini_client
+from app.services.gemini.lifespan import init_gemini, shutdown_gemini
+from app.services.http import get_http_client
+from app.services.http.lifespan import init_http_client, shutdown_http_client
+from app.services.jobs import get_job_manager
+from app.services.jobs.lifespan import init_jobs, shutdown_jobs
+from app.services.media import get_media_store
+from app.services.media.lifespan import init_media_store, shutdown_media_store
+from app.services.transcription import get_transcription_pool
+from app.services.transcription.lifespan import (
+    init_transcription,
+    shutdown_transcription,
+)
+from app.services.whisper import registry
+from app.services.whisper.registry import WhisperModelRegistry
+from app.services.workspaces import get_workspaces
+from app.services.workspaces.lifespan import init_workspaces
+
+# Attribute of app.state set by each service, and the getter that resolves it.
+_SERVICES = {
+    "coalescer": get_coalescer,
+    "document_downloader": get_document_downloader,
+    "gemini_client": get_gemini_client,
+    "http_client": get_http_client,
+    "job_manager": get_job_manager,
+    "media_store": get_media_store,
+    "transcription_pool": get_transcription_pool,
+    "workspaces": get_workspaces,
+}
+
+
+@pytest.mark.anyio
+async def test_getters_resolve_app_state(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """
+    Tests that every request gets the services created once at startup.
+
+    :param monkeypatch: pytest monkeypatch.
+    :param tmp_path: temporary directory.
+    """
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(settings, "media_dir", str(tmp_path / "media"))
+    monkeypatch.setattr(settings, "workspace_dir", str(tmp_path / "workspaces"))
+    monkeypatch.setattr(settings, "whisper_preload", False)
+    app = FastAPI()
+    (tmp_path / "cache").mkdir()
+
+    @app.get("/services")
+    async def services(
+        coalescer: Any = Depends(get_coalescer),
+        document_downloader: Any = Depends(get_document_downloader),
+        gemini_client: Any = Depends(get_gemini_client),
+        http_client: Any = Depends(get_http_client),
+        job_manager: Any = Depends(get_job_manager),
+        media_store: Any = Depends(get_media_store),
+        transcription_pool: Any = Depends(get_transcription_pool),
+        workspaces: Any = Depends(get_workspaces),
+    ) -> dict[str, bool]:
+        resolved = locals()
+        return {name: resolved[name] is getattr(app.state, name) for name in _SERVICES}
+
+    init_gemini(app)
+    await init_transcription(app)
+    init_workspaces(app)
+    init_media_store(app)
+    init_http_client(app)
+    init_documents(app)
+    init_coalescer(app)
+    init_jobs(app)
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test",
+        ) as client:
+            first = (await client.get("/services")).json()
+            second = (await client.get("/services")).json()
+    finally:
+        await shutdown_jobs(app)
+        await shutdown_gemini(app)
+        shutdown_transcription(app)
+        await shutdown_media_store(app)
+        await shutdown_http_client(app)
+
+    assert first == second == {name: True for name in _SERVICES}
+
+
+def test_whisper_model_loaded_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that each model size is loaded once, even by racing threads.
+
+    :param monkeypatch: pytest monkeypatch.
+    """
+    loads: list[str] = []
+
+    def load_model(size: str) -> object:
+        loads.append(size)
+        time.sleep(0.01)
+        return object()
+
+    monkeypatch.setattr(registry.whisper, "load_model", load_model)
+    models = WhisperModelRegistry()
+    results: list[object] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(models.get("base")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ["base"]
+    assert len(results) == 8
+    assert all(model is results[0] for model in results)
+    assert models.get("small") is not results[0]
+    assert loads == ["base", "small"]
+    assert models.loaded() == ["base", "small"]
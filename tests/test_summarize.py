@@ -0,0 +1,115 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.core.settings import settings
+from app.repositories.summarize import (
+    CHARS_PER_TOKEN,
+    condense_long_text,
+    estimate_tokens,
+    split_into_chunks,
+    truncate_to_tokens,
+)
+
+
+class _FakeGemini:
+    """Stands in for the Gemini client, answering every chunk with a fixed note."""
+
+    def __init__(self, note: str) -> None:
+        self.note = note
+        self.prompts: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt: str, **kwargs: Any) -> str:
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.note
+
+
+def test_estimate_tokens() -> None:
+    """Tests that tokens are estimated from the length, rounding up."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a" * CHARS_PER_TOKEN) == 1
+    assert estimate_tokens("a" * (CHARS_PER_TOKEN + 1)) == 2
+
+
+def test_chunks_break_between_sentences() -> None:
+    """Tests that chunks end on sentences, stay in budget and don't overlap."""
+    sentences = [f"Sentence number {index} is here." for index in range(40)]
+    text = " ".join(sentences)
+
+    chunks = split_into_chunks(text, chunk_tokens=25)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 25 * CHARS_PER_TOKEN for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+    # Every sentence lands in exactly one chunk, in order.
+    assert " ".join(chunks) == text
+
+
+def test_long_sentences_break_between_words() -> None:
+    """Tests that captions without punctuation are split between words."""
+    words = [f"word{index}" for index in range(200)]
+
+    chunks = split_into_chunks(" ".join(words), chunk_tokens=10)
+
+    assert all(len(chunk) <= 10 * CHARS_PER_TOKEN for chunk in chunks)
+    assert " ".join(chunks).split() == words
+
+
+def test_truncate_between_words() -> None:
+    """Tests that truncated text stays in budget and doesn't cut a word."""
+    text = " ".join(f"word{index}" for index in range(100))
+
+    truncated = truncate_to_tokens(text, 10)
+
+    assert len(truncated) <= 10 * CHARS_PER_TOKEN
+    assert text.startswith(truncated)
+    assert text[len(truncated)] == " "
+    assert truncate_to_tokens("short", 10) == "short"
+
+
+@pytest.mark.anyio
+async def test_condense_until_in_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that chunks are condensed concurrently until the notes fit the budget.
+
+    :param monkeypatch: pytest monkeypatch.
+    """
+    monkeypatch.setattr(settings, "summary_token_budget", 100)
+    monkeypatch.setattr(settings, "summary_chunk_tokens", 50)
+    monkeypatch.setattr(settings, "summary_concurrency", 3)
+    gemini: Any = _FakeGemini(note="Short note.")
+    text = " ".join(f"Sentence number {index} is here." for index in range(100))
+
+    notes = await condense_long_text(gemini, text, "English")
+
+    assert estimate_tokens(notes) <= 100
+    assert notes.split("\n\n") == ["Short note."] * len(gemini.prompts)
+    assert gemini.max_in_flight == 3
+    assert all(prompt.count("in English") == 1 for prompt in gemini.prompts)
+
+
+@pytest.mark.anyio
+async def test_condense_truncates_without_progress(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Tests that notes that stop shrinking are cut to the budget.
+
+    :param monkeypatch: pytest monkeypatch.
+    """
+    monkeypatch.setattr(settings, "summary_token_budget", 100)
+    monkeypatch.setattr(settings, "summary_chunk_tokens", 50)
+    gemini: Any = _FakeGemini(note="A note that is much longer than its chunk. " * 10)
+    text = " ".join(f"Sentence number {index} is here." for index in range(100))
+
+    notes = await condense_long_text(gemini, text, "English")
+
+    assert estimate_tokens(notes) <= 100
+    assert text.startswith(notes)
@@ -0,0 +1,125 @@
+import json
+from typing import Any, AsyncIterator, Optional
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.services.gemini import GeminiQuotaError, get_gemini_client
+from app.services.transcription import get_transcription_pool
+from app.services.transcripts import (
+    StoredTranscript,
+    TranscriptSource,
+    get_transcript_store,
+)
+from app.services.workspaces import get_workspaces
+from app.web.api.router import api_router
+
+
+class _FakeGemini:
+    """Stands in for the Gemini client, streaming a fixed summary."""
+
+    def __init__(self, error: Optional[Exception] = None) -> None:
+        self.error = error
+
+    async def generate_stream(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        yield "The video "
+        if self.error is not None:
+            raise self.error
+        yield "is about cats."
+
+
+class _FakeTranscriptStore:
+    """Stands in for the transcript store, knowing one video."""
+
+    async def get(self, video_id: str) -> Optional[StoredTranscript]:
+        if video_id != "abc":
+            return None
+        return StoredTranscript("Cats sleep a lot.", TranscriptSource.MANUAL, "en")
+
+
+def _app(gemini: _FakeGemini) -> FastAPI:
+    """
+    Create an application serving the API with fake services.
+
+    :param gemini: fake Gemini client.
+    :return: application.
+    """
+    app = FastAPI()
+    app.include_router(api_router)
+    app.dependency_overrides[get_gemini_client] = lambda: gemini
+    app.dependency_overrides[get_transcript_store] = _FakeTranscriptStore
+    app.dependency_overrides[get_transcription_pool] = lambda: None
+    app.dependency_overrides[get_workspaces] = lambda: None
+    return app
+
+
+async def _events(app: FastAPI, video_url: str) -> list[tuple[str, Any]]:
+    """
+    Stream the summary of a video and parse its events.
+
+    :param app: application.
+    :param video_url: URL of the video.
+    :return: name and data of every event, in order.
+    """
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+    ) as client:
+        response = await client.get(
+            "/summarize_video/stream",
+            params={"video_url": video_url, "language": "English"},
+        )
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append(
+            (event.removeprefix("event: "), json.loads(data.removeprefix("data: "))),
+        )
+    return events
+
+
+@pytest.mark.anyio
+async def test_stream_events_in_order() -> None:
+    """Tests that the source, every summary piece and the end are streamed."""
+    events = await _events(_app(_FakeGemini()), "https://youtu.be/abc")
+
+    assert events == [
+        (
+            "transcript_source",
+            {"source": "manual", "language": "en", "stored": True},
+        ),
+        ("summary", {"text": "The video "}),
+        ("summary", {"text": "is about cats."}),
+        ("done", {}),
+    ]
+
+
+@pytest.mark.anyio
+async def test_stream_ends_with_error() -> None:
+    """Tests that an invalid URL is reported as an error event."""
+    events = await _events(_app(_FakeGemini()), "https://example.com/video")
+
+    assert events == [
+        ("error", {"status_code": 400, "detail": "🚫 Invalid YouTube URL."}),
+    ]
+
+
+@pytest.mark.anyio
+async def test_quota_error_after_partial_summary() -> None:
+    """Tests that running out of quota mid-stream ends with a 429 error event."""
+    gemini = _FakeGemini(error=GeminiQuotaError("over quota", retry_after=12))
+
+    events = await _events(_app(gemini), "https://youtu.be/abc")
+
+    assert [event for event, _ in events] == [
+        "transcript_source",
+        "summary",
+        "error",
+    ]
+    assert events[-1][1] == {
+        "status_code": 429,
+        "detail": "over quota",
+        "retry_after": 12,
+    }
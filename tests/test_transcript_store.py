@@ -0,0 +1,44 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from app.services.transcripts import (
+    StoredTranscript,
+    TranscriptSource,
+    TranscriptStore,
+)
+
+
+@pytest.mark.anyio
+async def test_round_trip(tmp_path: Path) -> None:
+    """
+    Tests that a transcript comes back with its source and language.
+
+    :param tmp_path: temporary directory for the database.
+    """
+    store = TranscriptStore(tmp_path / "t.sqlite3", max_age=60, max_bytes=10**6)
+    transcript = StoredTranscript("hello world", TranscriptSource.WHISPER, "en")
+    assert await store.get("video") is None
+    await store.put("video", transcript)
+    assert await store.get("video") == transcript
+    assert store.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+    store.close()
+
+
+@pytest.mark.anyio
+async def test_oldest_entries_are_evicted(tmp_path: Path) -> None:
+    """
+    Tests that the oldest transcripts go first when over the size limit.
+
+    :param tmp_path: temporary directory for the database.
+    """
+    store = TranscriptStore(tmp_path / "t.sqlite3", max_age=60, max_bytes=1500)
+    for video_id in ("first", "second"):
+        # Random hex compresses to about half, so each entry is over 1000 bytes.
+        text = os.urandom(1000).hex()
+        await store.put(video_id, StoredTranscript(text, TranscriptSource.MANUAL, None))
+    assert await store.get("first") is None
+    assert await store.get("second") is not None
+    assert store.stats()["evictions"] == 1
+    store.close()
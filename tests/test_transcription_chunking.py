@@ -0,0 +1,49 @@
+import numpy as np
+
+from app.services.transcription.chunking import (
+    SAMPLE_RATE,
+    merge_transcripts,
+    plan_chunks,
+)
+
+
+def test_short_audio_is_one_segment() -> None:
+    """Tests that audio shorter than a chunk isn't split."""
+    audio = np.ones(SAMPLE_RATE * 5, dtype=np.float32)
+    assert plan_chunks(audio, chunk_seconds=10, overlap_seconds=1) == [
+        (0, len(audio)),
+    ]
+
+
+def test_boundaries_fall_on_silence() -> None:
+    """Tests that segments are cut in the quiet part near the target length."""
+    audio = np.ones(SAMPLE_RATE * 25, dtype=np.float32)
+    audio[SAMPLE_RATE * 11 : SAMPLE_RATE * 12] = 0
+    segments = plan_chunks(
+        audio,
+        chunk_seconds=10,
+        overlap_seconds=1,
+        search_seconds=3,
+    )
+    first_cut = segments[0][1] - SAMPLE_RATE
+    assert SAMPLE_RATE * 11 <= first_cut < SAMPLE_RATE * 12
+    assert segments[0][0] == 0
+    assert segments[-1][1] == len(audio)
+    for (_, end), (start, _) in zip(segments, segments[1:]):
+        assert end - start == 2 * SAMPLE_RATE
+
+
+def test_merge_drops_repeated_words() -> None:
+    """Tests that words repeated at segment overlaps are kept once."""
+    merged = merge_transcripts(
+        [
+            "Today we talk about the water cycle.",
+            "The water cycle, starts with evaporation",
+            "",
+            "nothing in common here",
+        ],
+    )
+    assert merged == (
+        "Today we talk about the water cycle. starts with evaporation "
+        "nothing in common here"
+    )
@@ -0,0 +1,79 @@
+import asyncio
+from typing import Any, Callable
+
+import pytest
+
+from app.services.transcription import (
+    Transcription,
+    TranscriptionBusyError,
+    TranscriptionPool,
+)
+
+
+def _pool(
+    monkeypatch: pytest.MonkeyPatch,
+    delay: float,
+    **kwargs: Any,
+) -> TranscriptionPool:
+    """
+    Create a pool whose jobs sleep instead of running Whisper in a process.
+
+    :param monkeypatch: pytest monkeypatch.
+    :param delay: seconds every job takes.
+    :param kwargs: arguments of the pool.
+    :return: pool.
+    """
+    pool = TranscriptionPool(model_size="base", **kwargs)
+
+    async def run(func: Callable[..., Any], *args: Any) -> Transcription:
+        await asyncio.sleep(delay)
+        return Transcription(text=f"text of {args[0]}", language="en")
+
+    monkeypatch.setattr(pool, "_run", run)
+    return pool
+
+
+@pytest.mark.anyio
+async def test_full_queue_is_busy(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that jobs beyond the workers and the queue are rejected.
+
+    :param monkeypatch: pytest monkeypatch.
+    """
+    pool = _pool(monkeypatch, 0.05, workers=1, queue_size=1, timeout=5)
+    try:
+        running = [
+            asyncio.create_task(pool.transcribe(f"audio{i}.pcm")) for i in range(2)
+        ]
+        await asyncio.sleep(0)
+        assert pool.stats()["active_jobs"] == 2
+
+        with pytest.raises(TranscriptionBusyError):
+            await pool.transcribe("audio2.pcm")
+
+        results = await asyncio.gather(*running)
+        assert [result.text for result in results] == [
+            "text of audio0.pcm",
+            "text of audio1.pcm",
+        ]
+        assert pool.stats()["active_jobs"] == 0
+        assert (await pool.transcribe("audio3.pcm")).language == "en"
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.anyio
+async def test_slow_job_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that a job running past the timeout fails and frees its place.
+
+    :param monkeypatch: pytest monkeypatch.
+    """
+    pool = _pool(monkeypatch, 1, workers=1, queue_size=0, timeout=0.01)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.transcribe("audio.pcm")
+
+        assert pool.stats()["active_jobs"] == 0
+    finally:
+        pool.shutdown()
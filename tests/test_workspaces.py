@@ -0,0 +1,97 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from app.services.workspaces import WorkspaceManager, WorkspaceQuotaError
+
+
+@pytest.mark.anyio
+async def test_job_directory_is_removed_on_error(tmp_path: Path) -> None:
+    """
+    Tests that a job's directory is unique and removed when the job fails.
+
+    :param tmp_path: temporary root for the workspaces.
+    """
+    workspaces = WorkspaceManager(
+        tmp_path,
+        quota_bytes=1024,
+        orphan_age=60,
+        job_bytes=512,
+    )
+    with pytest.raises(RuntimeError):
+        async with workspaces.job() as first, workspaces.job() as second:
+            assert first != second
+            (second / "audio.mp3").write_bytes(b"data")
+            raise RuntimeError
+    assert not first.exists()
+    assert not second.exists()
+    assert workspaces.stats()["active_jobs"] == 0
+    assert workspaces.stats()["bytes_reserved"] == 0
+
+
+@pytest.mark.anyio
+async def test_quota_is_enforced(tmp_path: Path) -> None:
+    """
+    Tests that no job starts while the quota is used up.
+
+    :param tmp_path: temporary root for the workspaces.
+    """
+    workspaces = WorkspaceManager(tmp_path, quota_bytes=10, orphan_age=60, job_bytes=10)
+    async with workspaces.job() as workdir:
+        (workdir / "audio.mp3").write_bytes(b"x" * 10)
+        assert workspaces.remaining() == 0
+        with pytest.raises(WorkspaceQuotaError):
+            async with workspaces.job():
+                pass
+
+
+@pytest.mark.anyio
+async def test_concurrent_jobs_share_the_quota(tmp_path: Path) -> None:
+    """
+    Tests that every job reserves its share, and other workers' files count.
+
+    :param tmp_path: temporary root for the workspaces.
+    """
+    workspaces = WorkspaceManager(
+        tmp_path,
+        quota_bytes=100,
+        orphan_age=60,
+        job_bytes=40,
+    )
+    other_worker = tmp_path / f"audio-{os.getppid()}-abc"
+    other_worker.mkdir()
+    (other_worker / "audio.pcm").write_bytes(b"x" * 30)
+
+    async with workspaces.job() as first, workspaces.job() as second:
+        assert workspaces.budget(first) == 40
+        # Only 30 bytes are left once the first job reserved its share.
+        assert workspaces.budget(second) == 30
+        assert workspaces.remaining() == 0
+        with pytest.raises(WorkspaceQuotaError):
+            async with workspaces.job():
+                pass
+    async with workspaces.job() as third:
+        assert workspaces.budget(third) == 40
+
+
+@pytest.mark.anyio
+async def test_orphans_are_reported_and_removed(tmp_path: Path) -> None:
+    """
+    Tests that leftovers of dead workers are orphans, active jobs aren't.
+
+    :param tmp_path: temporary root for the workspaces.
+    """
+    workspaces = WorkspaceManager(
+        tmp_path,
+        quota_bytes=1024,
+        orphan_age=3600,
+        job_bytes=512,
+    )
+    leftover = tmp_path / "audio-999999999-abc"
+    leftover.mkdir()
+    async with workspaces.job():
+        assert workspaces.orphans() == [leftover]
+        assert workspaces.remove_orphans() == 1
+        assert workspaces.stats()["orphans"] == 0
+    assert not leftover.exists()